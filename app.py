@@ -1,17 +1,17 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from datetime import datetime, timedelta
-import folium
-from streamlit_folium import st_folium
+import importlib
 import time
 import os
+import traceback
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+@st.cache_resource
+def _load_env():
+    """Load environment variables from .env once per process, not per rerun"""
+    load_dotenv()
+    return os.environ
+
+_load_env()
 
 # Page configuration
 st.set_page_config(
@@ -25,296 +25,206 @@ from utils.auth import check_authentication, logout
 from utils.data_models import get_mock_agrobots, get_mock_alerts, get_recent_data
 from utils.config import config
 
-# Import pages directly
-import pages.overview as overview
-import pages.argo_overview as argo_overview
-import pages.alerts as alerts  
-import pages.route_optimization as route_optimization
-import pages.ai_chat as ai_chat
-import pages.settings as settings
+# The light theme comes from .streamlit/config.toml. Theme options are
+# process-wide, so the per-session dark mode is applied as a CSS override.
+_CSS_HIDE_SIDEBAR = """
+<style>
+.css-1d391kg {
+    display: none;
+}
+section[data-testid="stSidebar"] {
+    display: none;
+}
+.css-1lcbmhc.e1fqkh3o0 {
+    margin-left: 0rem;
+}
+</style>
+"""
+
+_CSS_DARK = """
+<style>
+.stApp {
+    background-color: #0e1117;
+    color: #fafafa;
+}
+.stMarkdown, .stMarkdown p, .stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 {
+    color: #fafafa !important;
+}
+.stText, .stCaption {
+    color: #fafafa !important;
+}
+.stSelectbox > div > div {
+    background-color: #262730;
+    color: #fafafa;
+    border: 1px solid #4a4a4a;
+}
+.stSelectbox > div > div > div {
+    color: #fafafa;
+}
+.stTextInput > div > div > input {
+    background-color: #262730;
+    color: #fafafa;
+    border: 1px solid #4a4a4a;
+}
+.stButton > button {
+    background-color: #262730;
+    color: #fafafa !important;
+    border: 1px solid #4a4a4a;
+}
+.stButton > button:hover {
+    background-color: #3a3a3a;
+    border-color: #ffffff;
+    color: #fafafa !important;
+}
+.stButton > button[data-baseweb="button"][kind="primary"] {
+    background-color: #0068c9;
+    color: #ffffff !important;
+}
+.stButton > button[data-baseweb="button"][kind="primary"]:hover {
+    background-color: #0056b3;
+    color: #ffffff !important;
+}
+.stMetric {
+    background-color: #1e1e1e;
+    padding: 1rem;
+    border-radius: 0.5rem;
+    border: 1px solid #4a4a4a;
+}
+.stMetric > div {
+    color: #fafafa !important;
+}
+.stMetric label {
+    color: #fafafa !important;
+}
+.stPlotlyChart {
+    background-color: #1e1e1e;
+}
+.stDataFrame {
+    background-color: #262730;
+    color: #fafafa;
+}
+.stExpander {
+    background-color: #262730;
+    border: 1px solid #4a4a4a;
+}
+.stExpander > div > div {
+    color: #fafafa !important;
+}
+.stChatMessage {
+    background-color: #262730;
+    border: 1px solid #4a4a4a;
+}
+.stChatMessage > div {
+    color: #fafafa !important;
+}
+div[data-testid="stForm"] {
+    background-color: #262730;
+    border: 1px solid #4a4a4a;
+}
+div[data-testid="stForm"] > div {
+    color: #fafafa !important;
+}
+.stAlert {
+    background-color: #262730;
+    color: #fafafa !important;
+    border: 1px solid #4a4a4a;
+}
+</style>
+"""
+
+@st.cache_data
+def _theme_css(dark: bool) -> str:
+    """Build the stylesheet for the current theme"""
+    return _CSS_HIDE_SIDEBAR + _CSS_DARK if dark else _CSS_HIDE_SIDEBAR
+
+@st.cache_data(ttl=300, max_entries=1)
+def _bots_by_name():
+    """Index the Agro-Bot fleet by name for the bot selector"""
+    return {bot['name']: bot for bot in get_mock_agrobots()}
+
+# Page name -> (module in pages/, entry point). Page modules pull in plotly,
+# folium and LangChain, so each is imported on its first visit only.
+PAGE_MAP = {
+    "Overview": ("overview", "show_page"),
+    "ARGO Overview": ("argo_overview", "show_real_argo_overview"),
+    "Alerts": ("alerts", "show_page"),
+    "Route Optimization": ("route_optimization", "show_page"),
+    "AI Chat": ("ai_chat", "show_page"),
+    "Settings": ("settings", "show_page"),
+}
+
+# Shorter nav bar labels for the longer page names
+NAV_LABELS = {"ARGO Overview": "ARGO Data", "Route Optimization": "Routes"}
+
+def _on_nav_change():
+    """Navigation callback: switch page before the rerun renders it"""
+    page = st.session_state.nav
+    if page is None:
+        # Clicking the selected segment clears it; keep the current page instead
+        st.session_state.nav = st.session_state.current_page
+        return
+    st.session_state.current_page = page
+    st.query_params["page"] = page
+
+def _toggle_dark_mode():
+    """Dark mode callback: flip the theme before the rerun renders it"""
+    st.session_state.dark_mode = not st.session_state.dark_mode
+
+@st.fragment
+def _bot_bar():
+    """Bot selector and logout row. Picking a bot only reruns this row; the
+    selection is kept in session state and nothing else on the page reads it."""
+    col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
+    
+    with col1:
+        bots_by_name = _bots_by_name()
+        bot_names = ["No Bot Selected"] + list(bots_by_name)
+        selected_bot_name = st.selectbox("Select Agro-Bot", bot_names, key="bot_selector")
+        
+        # "No Bot Selected" is not a key, so it maps to None
+        st.session_state.selected_bot = bots_by_name.get(selected_bot_name)
+    
+    with col2:
+        st.write("")  # Empty space
+    
+    with col3:
+        st.write("")  # Empty space
+    
+    with col4:
+        if st.button("Logout", type="secondary", use_container_width=True):
+            logout()
+            # Leaving the dashboard needs a full app rerun, not a fragment rerun
+            st.rerun()
 
 def main():
     """Main application entry point"""
     
-    # Initialize session state
-    if 'authenticated' not in st.session_state:
-        st.session_state.authenticated = False
-    if 'user' not in st.session_state:
-        st.session_state.user = None
-    if 'selected_bot' not in st.session_state:
-        st.session_state.selected_bot = None
-    if 'dark_mode' not in st.session_state:
-        st.session_state.dark_mode = False
-    if 'current_page' not in st.session_state:
-        st.session_state.current_page = "Overview"
+    # Initialize session state once per session behind a single sentinel
+    if '_inited' not in st.session_state:
+        # Restore the page from the URL so links and browser refreshes keep it
+        requested_page = st.query_params.get("page", "Overview")
+        st.session_state.update(
+            authenticated=False,
+            user=None,
+            selected_bot=None,
+            dark_mode=False,
+            current_page=requested_page if requested_page in PAGE_MAP else "Overview",
+            _inited=True
+        )
+    
+    # Inject the theme stylesheet once per rerun
+    st.html(_theme_css(st.session_state.dark_mode))
     
     # Check authentication - if not authenticated, show login page without sidebar
     if not st.session_state.authenticated:
-        # Hide sidebar completely for login page
-        st.markdown("""
-        <style>
-        .css-1d391kg {
-            display: none;
-        }
-        section[data-testid="stSidebar"] {
-            display: none;
-        }
-        .css-1lcbmhc.e1fqkh3o0 {
-            margin-left: 0rem;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
-        # Apply theme for login page
-        if st.session_state.dark_mode:
-            st.markdown("""
-            <style>
-            .stApp {
-                background-color: #0e1117;
-                color: #fafafa;
-            }
-            .stMarkdown, .stMarkdown p, .stMarkdown h1, .stMarkdown h2, .stMarkdown h3 {
-                color: #fafafa !important;
-            }
-            .stTextInput > div > div > input {
-                background-color: #262730;
-                color: #fafafa;
-                border: 1px solid #4a4a4a;
-            }
-            .stButton > button {
-                background-color: #262730;
-                color: #fafafa !important;
-                border: 1px solid #4a4a4a;
-            }
-            .stExpander {
-                background-color: #262730;
-                border: 1px solid #4a4a4a;
-            }
-            .stExpander > div > div {
-                color: #fafafa !important;
-            }
-            </style>
-            """, unsafe_allow_html=True)
-        else:
-            st.markdown("""
-            <style>
-            .stApp {
-                background-color: #ffffff;
-                color: #262730;
-            }
-            .stMarkdown, .stMarkdown p, .stMarkdown h1, .stMarkdown h2, .stMarkdown h3 {
-                color: #262730 !important;
-            }
-            </style>
-            """, unsafe_allow_html=True)
-        
         show_login_page()
         return
     
-    # Hide sidebar for authenticated users too
-    st.markdown("""
-    <style>
-    .css-1d391kg {
-        display: none;
-    }
-    section[data-testid="stSidebar"] {
-        display: none;
-    }
-    .css-1lcbmhc.e1fqkh3o0 {
-        margin-left: 0rem;
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    # Apply dark mode if enabled
-    if st.session_state.dark_mode:
-        st.markdown("""
-        <style>
-        .stApp {
-            background-color: #0e1117;
-            color: #fafafa;
-        }
-        .stMarkdown, .stMarkdown p, .stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 {
-            color: #fafafa !important;
-        }
-        .stText, .stCaption {
-            color: #fafafa !important;
-        }
-        .stSelectbox > div > div {
-            background-color: #262730;
-            color: #fafafa;
-            border: 1px solid #4a4a4a;
-        }
-        .stSelectbox > div > div > div {
-            color: #fafafa;
-        }
-        .stTextInput > div > div > input {
-            background-color: #262730;
-            color: #fafafa;
-            border: 1px solid #4a4a4a;
-        }
-        .stButton > button {
-            background-color: #262730;
-            color: #fafafa !important;
-            border: 1px solid #4a4a4a;
-        }
-        .stButton > button:hover {
-            background-color: #3a3a3a;
-            border-color: #ffffff;
-            color: #fafafa !important;
-        }
-        .stButton > button[data-baseweb="button"][kind="primary"] {
-            background-color: #0068c9;
-            color: #ffffff !important;
-        }
-        .stButton > button[data-baseweb="button"][kind="primary"]:hover {
-            background-color: #0056b3;
-            color: #ffffff !important;
-        }
-        .stMetric {
-            background-color: #1e1e1e;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            border: 1px solid #4a4a4a;
-        }
-        .stMetric > div {
-            color: #fafafa !important;
-        }
-        .stMetric label {
-            color: #fafafa !important;
-        }
-        .stPlotlyChart {
-            background-color: #1e1e1e;
-        }
-        .stDataFrame {
-            background-color: #262730;
-            color: #fafafa;
-        }
-        .stExpander {
-            background-color: #262730;
-            border: 1px solid #4a4a4a;
-        }
-        .stExpander > div > div {
-            color: #fafafa !important;
-        }
-        .stChatMessage {
-            background-color: #262730;
-            border: 1px solid #4a4a4a;
-        }
-        .stChatMessage > div {
-            color: #fafafa !important;
-        }
-        div[data-testid="stForm"] {
-            background-color: #262730;
-            border: 1px solid #4a4a4a;
-        }
-        div[data-testid="stForm"] > div {
-            color: #fafafa !important;
-        }
-        .stAlert {
-            background-color: #262730;
-            color: #fafafa !important;
-            border: 1px solid #4a4a4a;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-    else:
-        st.markdown("""
-        <style>
-        .stApp {
-            background-color: #ffffff;
-            color: #262730;
-        }
-        .stMarkdown, .stMarkdown p, .stMarkdown h1, .stMarkdown h2, .stMarkdown h3, .stMarkdown h4, .stMarkdown h5, .stMarkdown h6 {
-            color: #262730 !important;
-        }
-        .stText, .stCaption {
-            color: #262730 !important;
-        }
-        .stSelectbox > div > div {
-            background-color: #ffffff;
-            color: #262730;
-            border: 1px solid #ddd;
-        }
-        .stSelectbox > div > div > div {
-            color: #262730;
-        }
-        .stTextInput > div > div > input {
-            background-color: #ffffff;
-            color: #262730;
-            border: 1px solid #ddd;
-        }
-        .stButton > button {
-            background-color: #ffffff;
-            color: #262730 !important;
-            border: 1px solid #ddd;
-        }
-        .stButton > button:hover {
-            background-color: #f0f0f0;
-            border-color: #999;
-            color: #262730 !important;
-        }
-        .stButton > button[data-baseweb="button"][kind="primary"] {
-            background-color: #0068c9;
-            color: #ffffff !important;
-        }
-        .stButton > button[data-baseweb="button"][kind="primary"]:hover {
-            background-color: #0056b3;
-            color: #ffffff !important;
-        }
-        .stMetric {
-            background-color: #ffffff;
-            padding: 1rem;
-            border-radius: 0.5rem;
-            border: 1px solid #ddd;
-        }
-        .stMetric > div {
-            color: #262730 !important;
-        }
-        .stMetric label {
-            color: #262730 !important;
-        }
-        .stPlotlyChart {
-            background-color: #ffffff;
-        }
-        .stDataFrame {
-            background-color: #ffffff;
-            color: #262730;
-        }
-        .stExpander {
-            background-color: #ffffff;
-            border: 1px solid #ddd;
-        }
-        .stExpander > div > div {
-            color: #262730 !important;
-        }
-        .stChatMessage {
-            background-color: #ffffff;
-            border: 1px solid #ddd;
-        }
-        .stChatMessage > div {
-            color: #262730 !important;
-        }
-        div[data-testid="stForm"] {
-            background-color: #ffffff;
-            border: 1px solid #ddd;
-        }
-        div[data-testid="stForm"] > div {
-            color: #262730 !important;
-        }
-        .stAlert {
-            background-color: #ffffff;
-            color: #262730 !important;
-            border: 1px solid #ddd;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-    
     # For authenticated users, show main navigation
     st.markdown("---")
     
     # Top navigation bar
-    col1, col2, col3, col4, col5, col6, col7, col8 = st.columns([2, 1, 1, 1, 1, 1, 1, 1])
+    col1, col2, col3 = st.columns([2, 6, 1])
     
     with col1:
         st.markdown("### Agro-Ocean SIH Dashboard")
@@ -322,90 +232,39 @@ def main():
             st.caption(f"Welcome, {st.session_state.user['name']} ({st.session_state.user['role'].replace('_', ' ').title()})")
     
     with col2:
-        if st.button("Overview", use_container_width=True, type="primary" if st.session_state.current_page == "Overview" else "secondary"):
-            st.session_state.current_page = "Overview"
-            st.rerun()
+        # Seed the widget state rather than passing default=, since the
+        # callback also writes to it
+        if 'nav' not in st.session_state:
+            st.session_state.nav = st.session_state.current_page
+        st.segmented_control(
+            "Navigation",
+            list(PAGE_MAP),
+            format_func=lambda page: NAV_LABELS.get(page, page),
+            key="nav",
+            on_change=_on_nav_change,
+            label_visibility="collapsed"
+        )
     
     with col3:
-        if st.button("ARGO Data", use_container_width=True, type="primary" if st.session_state.current_page == "ARGO Overview" else "secondary"):
-            st.session_state.current_page = "ARGO Overview"
-            st.rerun()
-    
-    with col4:
-        if st.button("Alerts", use_container_width=True, type="primary" if st.session_state.current_page == "Alerts" else "secondary"):
-            st.session_state.current_page = "Alerts"
-            st.rerun()
-    
-    with col5:
-        if st.button("Routes", use_container_width=True, type="primary" if st.session_state.current_page == "Route Optimization" else "secondary"):
-            st.session_state.current_page = "Route Optimization"
-            st.rerun()
-    
-    with col6:
-        if st.button("AI Chat", use_container_width=True, type="primary" if st.session_state.current_page == "AI Chat" else "secondary"):
-            st.session_state.current_page = "AI Chat"
-            st.rerun()
-    
-    with col7:
-        if st.button("Settings", use_container_width=True, type="primary" if st.session_state.current_page == "Settings" else "secondary"):
-            st.session_state.current_page = "Settings"
-            st.rerun()
-    
-    with col8:
-        # Dark mode toggle
-        dark_mode_label = "Dark Mode" if not st.session_state.dark_mode else "Light Mode"
-        if st.button(dark_mode_label, use_container_width=True):
-            st.session_state.dark_mode = not st.session_state.dark_mode
-            st.rerun()
+        st.toggle("Dark Mode", value=st.session_state.dark_mode, on_change=_toggle_dark_mode)
     
     # Bot selection and logout in a second row
-    col1, col2, col3, col4 = st.columns([2, 2, 1, 1])
-    
-    with col1:
-        bots = get_mock_agrobots()
-        bot_names = ["No Bot Selected"] + [bot['name'] for bot in bots]
-        selected_bot_name = st.selectbox("Select Agro-Bot", bot_names, key="bot_selector")
-        
-        if selected_bot_name != "No Bot Selected":
-            st.session_state.selected_bot = next((bot for bot in bots if bot['name'] == selected_bot_name), None)
-        else:
-            st.session_state.selected_bot = None
-    
-    with col2:
-        st.write("")  # Empty space
-    
-    with col3:
-        st.write("")  # Empty space
-    
-    with col4:
-        if st.button("Logout", type="secondary", use_container_width=True):
-            logout()
-            st.rerun()
+    _bot_bar()
     
     st.markdown("---")
     
     # Main content area - use session state page
     try:
-        if st.session_state.current_page == "Overview":
-            overview.show_page()
-        elif st.session_state.current_page == "ARGO Overview":
-            argo_overview.show_real_argo_overview()
-        elif st.session_state.current_page == "Alerts":
-            alerts.show_page()
-        elif st.session_state.current_page == "Route Optimization":
-            route_optimization.show_page()
-        elif st.session_state.current_page == "AI Chat":
-            ai_chat.show_page()
-        elif st.session_state.current_page == "Settings":
-            settings.show_page()
+        module_name, entry_point = PAGE_MAP[st.session_state.current_page]
+        page = importlib.import_module(f"pages.{module_name}")
+        getattr(page, entry_point)()
     except Exception as e:
         st.error(f"Error loading page '{st.session_state.current_page}': {str(e)}")
         st.write("Debug info:")
         st.write(f"Current page: {st.session_state.current_page}")
-        st.write(f"Available pages: Overview, ARGO Overview, Alerts, Route Optimization, AI Chat, Settings")
+        st.write(f"Available pages: {', '.join(PAGE_MAP)}")
         
         # Show traceback for debugging
-        import traceback
         st.code(traceback.format_exc())
 
 def show_login_page():
@@ -413,10 +272,7 @@ def show_login_page():
     # Dark mode toggle for login page
     col_left, col_right = st.columns([4, 1])
     with col_right:
-        dark_mode_label = "Dark Mode" if not st.session_state.dark_mode else "Light Mode"
-        if st.button(dark_mode_label, key="login_dark_mode"):
-            st.session_state.dark_mode = not st.session_state.dark_mode
-            st.rerun()
+        st.toggle("Dark Mode", value=st.session_state.dark_mode, on_change=_toggle_dark_mode)
     
     # Center the content with better spacing
     st.markdown("<br>", unsafe_allow_html=True)
@@ -2,8 +2,7 @@
 Check IFREMER 2020 directory structure
 """
 
-import requests
-from bs4 import BeautifulSoup
+from utils.argo_listing import NC_RE, DIR_RE, scan_listing
 
 def check_ifremer_2020():
     """Check what's in IFREMER 2020 directory"""
@@ -12,21 +11,8 @@ def check_ifremer_2020():
     
     try:
         url = "https://data-argo.ifremer.fr/geo/indian_ocean/2020/"
-        response = requests.get(url, timeout=15)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            links = soup.find_all('a')
-            
-            dirs = []
-            files = []
-            
-            for link in links:
-                href = link.get('href', '')
-                if href and not href.startswith('..'):
-                    if href.endswith('/'):
-                        dirs.append(href.rstrip('/'))
-                    elif href.endswith('.nc'):
-                        files.append(href)
+        status, (dirs, files) = scan_listing(url, DIR_RE, NC_RE)
+        if status == 200:
             
             print(f"📁 Directories found: {len(dirs)}")
             for d in dirs[:10]:
@@ -40,17 +26,14 @@ def check_ifremer_2020():
             if dirs:
                 subdir_url = url + dirs[0] + "/"
                 print(f"\n🔍 Checking subdirectory: {dirs[0]}")
-                sub_response = requests.get(subdir_url, timeout=15)
-                if sub_response.status_code == 200:
-                    sub_soup = BeautifulSoup(sub_response.text, 'html.parser')
-                    sub_links = sub_soup.find_all('a')
-                    sub_files = [l.get('href', '') for l in sub_links if l.get('href', '').endswith('.nc')]
+                sub_status, (sub_files,) = scan_listing(subdir_url, NC_RE)
+                if sub_status == 200:
                     print(f"   📄 NetCDF files in {dirs[0]}: {len(sub_files)}")
                     for sf in sub_files[:3]:
                         print(f"      🗂️ {sf}")
                 
         else:
-            print(f"❌ Status: {response.status_code}")
+            print(f"❌ Status: {status}")
     except Exception as e:
         print(f"❌ Error: {e}")
 
@@ -61,23 +44,15 @@ def check_noaa_2020():
     
     try:
         url = "https://www.ncei.noaa.gov/data/oceans/argo/gadr/data/indian/2020/"
-        response = requests.get(url, timeout=15)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            links = soup.find_all('a')
-            
-            netcdf_files = []
-            for link in links:
-                href = link.get('href', '')
-                if href and href.endswith('.nc'):
-                    netcdf_files.append(href)
+        status, (netcdf_files,) = scan_listing(url, NC_RE)
+        if status == 200:
             
             print(f"📄 NetCDF files found: {len(netcdf_files)}")
             for f in netcdf_files[:5]:
                 print(f"   🗂️ {f}")
                 
         else:
-            print(f"❌ Status: {response.status_code}")
+            print(f"❌ Status: {status}")
     except Exception as e:
         print(f"❌ Error: {e}")
 
@@ -2,8 +2,21 @@
 Check IFREMER monthly directory for actual files
 """
 
-import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from utils.argo_listing import NC_RE, scan_listing
+
+def scan_listings(urls, pattern, max_workers=8):
+    """Scan several listings concurrently, returning results in the order of urls.
+    A failed request yields its exception instead of a (status, hrefs) pair."""
+    def scan(url):
+        try:
+            status, (hrefs,) = scan_listing(url, pattern)
+            return status, hrefs
+        except Exception as e:
+            return e
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(scan, urls))
 
 def check_ifremer_monthly():
     """Check monthly subdirectories for NetCDF files"""
@@ -12,21 +25,16 @@ def check_ifremer_monthly():
     
     base_url = "https://data-argo.ifremer.fr/geo/indian_ocean/2020/"
     
-    for month in ["01", "02", "03"]:  # Check first few months
+    months = ["01", "02", "03"]  # Check first few months
+    results = scan_listings([f"{base_url}{month}/" for month in months], NC_RE)
+    
+    for month, result in zip(months, results):
         print(f"\n📅 Checking month {month}:")
         try:
-            url = f"{base_url}{month}/"
-            response = requests.get(url, timeout=15)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                links = soup.find_all('a')
-                
-                netcdf_files = []
-                for link in links:
-                    href = link.get('href', '')
-                    if href and href.endswith('.nc'):
-                        netcdf_files.append(href)
-                
+            if isinstance(result, Exception):
+                raise result
+            status, netcdf_files = result
+            if status == 200:
                 print(f"   📄 Found {len(netcdf_files)} NetCDF files")
                 if netcdf_files:
                     for f in netcdf_files[:3]:
@@ -35,7 +43,7 @@ def check_ifremer_monthly():
                         print(f"      ... and {len(netcdf_files) - 3} more")
                 
             else:
-                print(f"   ❌ Status: {response.status_code}")
+                print(f"   ❌ Status: {status}")
         except Exception as e:
             print(f"   ❌ Error: {e}")
 
@@ -46,21 +54,16 @@ def check_noaa_older_years():
     
     base_url = "https://www.ncei.noaa.gov/data/oceans/argo/gadr/data/indian/"
     
-    for year in ["2019", "2018"]:
+    years = ["2019", "2018"]
+    results = scan_listings([f"{base_url}{year}/" for year in years], NC_RE)
+    
+    for year, result in zip(years, results):
         print(f"\n📅 Checking year {year}:")
         try:
-            url = f"{base_url}{year}/"
-            response = requests.get(url, timeout=15)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                links = soup.find_all('a')
-                
-                netcdf_files = []
-                for link in links:
-                    href = link.get('href', '')
-                    if href and href.endswith('.nc'):
-                        netcdf_files.append(href)
-                
+            if isinstance(result, Exception):
+                raise result
+            status, netcdf_files = result
+            if status == 200:
                 print(f"   📄 Found {len(netcdf_files)} NetCDF files")
                 if netcdf_files:
                     for f in netcdf_files[:3]:
@@ -69,7 +72,7 @@ def check_noaa_older_years():
                         print(f"      ... and {len(netcdf_files) - 3} more")
                 
             else:
-                print(f"   ❌ Status: {response.status_code}")
+                print(f"   ❌ Status: {status}")
         except Exception as e:
             print(f"   ❌ Error: {e}")
 
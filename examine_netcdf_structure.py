@@ -5,6 +5,40 @@ Diagnostic script to examine NetCDF file structure
 import xarray as xr
 import numpy as np
 import os
+import io
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+def sample_values(var, n=5):
+    """Return the first n values of var in flat order, reading only the leading rows"""
+    if var.ndim == 0:
+        return var.values.reshape(-1)[:n]
+    row_size = max(int(np.prod(var.shape[1:])), 1)
+    rows = -(-n // row_size)  # ceil(n / row_size)
+    return var.isel({var.dims[0]: slice(0, rows)}).values.flat[:n]
+
+def _show_values(var):
+    print(f"      values={var.values if var.size <= 5 else f'[array of {var.size} elements]'}")
+
+def _show_pressure(var):
+    print(f"      sample values: {sample_values(var) if var.size > 0 else 'empty'}")
+
+def _show_samples(var):
+    sample_vals = sample_values(var) if var.size > 0 else []
+    print(f"      sample values: {sample_vals}")
+
+def _show_all_values(var):
+    print(f"      values={var.values}")
+
+# (candidate names, show only the first present one, printer) in display order
+KEY_VARIABLE_GROUPS = [
+    (('LATITUDE', 'LONGITUDE', 'LAT', 'LON'), True, _show_values),
+    (('JULD', 'TIME'), True, _show_values),
+    (('PRES', 'PRESSURE'), True, _show_pressure),
+    (('TEMP', 'PSAL', 'DOXY'), False, _show_samples),
+    (('PLATFORM_NUMBER',), True, _show_all_values),
+]
+KEY_VARIABLES = frozenset(name for candidates, _, _ in KEY_VARIABLE_GROUPS for name in candidates)
 
 def examine_netcdf_file(filepath):
     """Examine the structure of a NetCDF file"""
@@ -22,43 +56,14 @@ def examine_netcdf_file(filepath):
         
         print("\n🗃️ Key Variables:")
         
-        # Check coordinates
-        for coord in ['LATITUDE', 'LONGITUDE', 'LAT', 'LON']:
-            if coord in ds:
-                var = ds[coord]
-                print(f"   {coord}: shape={var.shape}, dtype={var.dtype}")
-                print(f"      values={var.values if var.size <= 5 else f'[array of {var.size} elements]'}")
-                break
-        
-        # Check time
-        for time_var in ['JULD', 'TIME']:
-            if time_var in ds:
-                var = ds[time_var]
-                print(f"   {time_var}: shape={var.shape}, dtype={var.dtype}")
-                print(f"      values={var.values if var.size <= 5 else f'[array of {var.size} elements]'}")
-                break
-        
-        # Check pressure
-        for pres_var in ['PRES', 'PRESSURE']:
-            if pres_var in ds:
-                var = ds[pres_var]
-                print(f"   {pres_var}: shape={var.shape}, dtype={var.dtype}")
-                print(f"      sample values: {var.values.flat[:5] if var.size > 0 else 'empty'}")
-                break
-        
-        # Check other variables
-        for var_name in ['TEMP', 'PSAL', 'DOXY']:
-            if var_name in ds:
-                var = ds[var_name]
-                print(f"   {var_name}: shape={var.shape}, dtype={var.dtype}")
-                sample_vals = var.values.flat[:5] if var.size > 0 else []
-                print(f"      sample values: {sample_vals}")
-        
-        # Check platform number
-        if 'PLATFORM_NUMBER' in ds:
-            pn = ds['PLATFORM_NUMBER']
-            print(f"   PLATFORM_NUMBER: shape={pn.shape}, dtype={pn.dtype}")
-            print(f"      values={pn.values}")
+        # One set intersection instead of a containment check per candidate
+        present = KEY_VARIABLES.intersection(ds.variables)
+        for candidates, first_only, show in KEY_VARIABLE_GROUPS:
+            names = [name for name in candidates if name in present]
+            for name in names[:1] if first_only else names:
+                var = ds[name]
+                print(f"   {name}: shape={var.shape}, dtype={var.dtype}")
+                show(var)
         
         print(f"\n🔗 Dataset attributes:")
         for key, value in list(ds.attrs.items())[:5]:
@@ -69,6 +74,14 @@ def examine_netcdf_file(filepath):
     except Exception as e:
         print(f"❌ Error examining file: {e}")
 
+def examine_netcdf_report(filepath):
+    """Run examine_netcdf_file and return its output as text, so files can be
+    examined in worker processes and still printed one after another"""
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        examine_netcdf_file(filepath)
+    return buffer.getvalue()
+
 def main():
     """Examine downloaded NetCDF files"""
     data_dir = "indian_ocean_argo_data"
@@ -85,12 +98,13 @@ def main():
     
     print(f"🔍 Found {len(nc_files)} NetCDF files")
     
-    # Examine first file in detail
-    for i, nc_file in enumerate(nc_files[:2]):  # Check first 2 files
-        filepath = os.path.join(data_dir, nc_file)
-        examine_netcdf_file(filepath)
-        if i < len(nc_files) - 1:
-            print("\n" + "="*80 + "\n")
+    # Examine the first files in detail, opening them in parallel
+    filepaths = [os.path.join(data_dir, nc_file) for nc_file in nc_files[:2]]  # Check first 2 files
+    with ProcessPoolExecutor() as executor:
+        for i, report in enumerate(executor.map(examine_netcdf_report, filepaths)):
+            print(report, end="")
+            if i < len(nc_files) - 1:
+                print("\n" + "="*80 + "\n")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
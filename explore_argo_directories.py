@@ -2,80 +2,134 @@
 Directory exploration script for ARGO data sources
 """
 
-import requests
-from bs4 import BeautifulSoup
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+import io
+import sys
+import heapq
 import re
+import functools
+from utils.argo_listing import NC_RE, sample_listing
+
+IFREMER_BASE_URL = "https://data-argo.ifremer.fr/geo/indian_ocean/"
+NOAA_BASE_URL = "https://www.ncei.noaa.gov/data/oceans/argo/gadr/data/"
+NOAA_INDIAN_URL = "https://www.ncei.noaa.gov/data/oceans/argo/gadr/data/indian/"
+IFREMER_2023_URL = "https://data-argo.ifremer.fr/geo/indian_ocean/2023/"
+
+# Year subdirectories (e.g. "2023/") in a directory listing
+YEAR_DIR_RE = re.compile(r'^\d{4}/$')
+
+# href selectors evaluated by libxml2 rather than a Python loop per link
+ALL_HREFS = etree.XPath("//a/@href")
+DIR_HREFS = etree.XPath(
+    "//a/@href[substring(., string-length(.)) = '/' and not(starts-with(., '..'))]"
+)
+
+@functools.lru_cache(maxsize=1)
+def get_session():
+    """Shared session so the probes reuse pooled keep-alive connections;
+    listings are cached on disk for an hour so repeated runs only revalidate
+    them. Built on first use, so importing the module creates no cache file."""
+    session = requests_cache.CachedSession(
+        cache_name='.argo_http_cache',
+        backend='sqlite',
+        expire_after=3600,
+    )
+    session.mount("https://", HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.3)
+    ))
+    return session
+
+def dir_names(root):
+    """Subdirectory names in a parsed listing, without the parent link"""
+    return [href.rstrip('/') for href in DIR_HREFS(root)]
+
+def year_names(root):
+    """Year subdirectory names (e.g. "2023") in a parsed listing"""
+    return [href.rstrip('/') for href in ALL_HREFS(root) if YEAR_DIR_RE.match(href)]
+
+def list_dir(url, select):
+    """Stream a directory listing through an incremental lxml parser and
+    return (status_code, select(root))"""
+    with get_session().get(url, stream=True, timeout=15) as response:
+        if response.status_code != 200:
+            return response.status_code, []
+        parser = etree.HTMLParser(encoding='utf-8')
+        for chunk in response.iter_content(chunk_size=65536):
+            parser.feed(chunk)
+        return 200, select(parser.close())
 
 def explore_directories():
     """Explore the actual directory structure of both data sources"""
     print("🔍 Exploring ARGO Data Source Directory Structures")
     print("=" * 60)
     
+    # Open the cache before the workers start so they all share one session
+    get_session()
+    
+    # The four probes are independent, so fetch them concurrently; any
+    # request error is re-raised by .result() inside its report block
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        ifremer_base = executor.submit(list_dir, IFREMER_BASE_URL, dir_names)
+        noaa_base = executor.submit(list_dir, NOAA_BASE_URL, dir_names)
+        noaa_indian = executor.submit(list_dir, NOAA_INDIAN_URL, year_names)
+        # The 2023 block only shows a sample, so it needn't read the whole
+        # listing; this probe goes through the uncached listing session, since
+        # caching would read the whole body in order to store it
+        ifremer_2023 = executor.submit(sample_listing, IFREMER_2023_URL, NC_RE, 3)
+    
+    # Render the four blocks into one buffer and write it out in a single call
+    report = io.StringIO()
+    with redirect_stdout(report):
+        print_report(ifremer_base, noaa_base, noaa_indian, ifremer_2023)
+    sys.stdout.write(report.getvalue())
+
+def print_report(ifremer_base, noaa_base, noaa_indian, ifremer_2023):
+    """Print the probe results in their original 1-4 order"""
     # Test IFREMER base
     print("\n1️⃣ IFREMER Indian Ocean Base Structure:")
     try:
-        url = "https://data-argo.ifremer.fr/geo/indian_ocean/"
-        response = requests.get(url, timeout=15)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            links = soup.find_all('a')
-            dirs = []
-            for link in links:
-                href = link.get('href', '')
-                if href and href.endswith('/') and not href.startswith('..'):
-                    dirs.append(href.rstrip('/'))
-            
+        status_code, dirs = ifremer_base.result()
+        if status_code == 200:
             print(f"   ✅ Found {len(dirs)} directories:")
-            for d in sorted(dirs)[:10]:  # Show first 10
+            for d in heapq.nsmallest(10, dirs):  # Show first 10
                 print(f"      📁 {d}")
             if len(dirs) > 10:
                 print(f"      ... and {len(dirs) - 10} more")
         else:
-            print(f"   ❌ Status: {response.status_code}")
+            print(f"   ❌ Status: {status_code}")
     except Exception as e:
         print(f"   ❌ Error: {e}")
     
     # Test NOAA NCEI base
     print("\n2️⃣ NOAA NCEI Base Structure:")
     try:
-        url = "https://www.ncei.noaa.gov/data/oceans/argo/gadr/data/"
-        response = requests.get(url, timeout=15)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            links = soup.find_all('a')
-            dirs = []
-            for link in links:
-                href = link.get('href', '')
-                if href and href.endswith('/') and not href.startswith('..'):
-                    dirs.append(href.rstrip('/'))
-            
+        status_code, dirs = noaa_base.result()
+        if status_code == 200:
             print(f"   ✅ Found {len(dirs)} directories:")
             for d in sorted(dirs):
                 print(f"      📁 {d}")
         else:
-            print(f"   ❌ Status: {response.status_code}")
+            print(f"   ❌ Status: {status_code}")
     except Exception as e:
         print(f"   ❌ Error: {e}")
     
     # Test NOAA Indian specific
     print("\n3️⃣ NOAA NCEI Indian Directory:")
     try:
-        url = "https://www.ncei.noaa.gov/data/oceans/argo/gadr/data/indian/"
-        response = requests.get(url, timeout=15)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            links = soup.find_all('a')
-            years = []
-            for link in links:
-                href = link.get('href', '')
-                if href and href.endswith('/') and re.match(r'\d{4}/', href):
-                    years.append(href.rstrip('/'))
-            
+        status_code, years = noaa_indian.result()
+        if status_code == 200:
             print(f"   ✅ Found {len(years)} year directories:")
             for year in sorted(years):
                 print(f"      📅 {year}")
         else:
-            print(f"   ❌ Status: {response.status_code}")
+            print(f"   ❌ Status: {status_code}")
     except Exception as e:
         print(f"   ❌ Error: {e}")
     
@@ -83,24 +137,17 @@ def explore_directories():
     print("\n4️⃣ IFREMER Recent Year Sample:")
     try:
         # Try 2023 which should have data
-        url = "https://data-argo.ifremer.fr/geo/indian_ocean/2023/"
-        response = requests.get(url, timeout=15)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            links = soup.find_all('a')
-            netcdf_files = []
-            for link in links:
-                href = link.get('href', '')
-                if href and href.endswith('.nc'):
-                    netcdf_files.append(href)
-            
-            print(f"   ✅ 2023 directory contains {len(netcdf_files)} NetCDF files")
+        status_code, netcdf_files, count, complete = ifremer_2023.result()
+        if status_code == 200:
+            if not complete:
+                count = f"at least {count}"
+            print(f"   ✅ 2023 directory contains {count} NetCDF files")
             if netcdf_files:
                 print(f"   📄 Sample files:")
-                for f in netcdf_files[:3]:
+                for f in netcdf_files:
                     print(f"      • {f}")
         else:
-            print(f"   ❌ 2023 directory status: {response.status_code}")
+            print(f"   ❌ 2023 directory status: {status_code}")
     except Exception as e:
         print(f"   ❌ Error accessing 2023: {e}")
 
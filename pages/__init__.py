@@ -1,9 +1,19 @@
 # Pages module for Agro-Ocean Streamlit app
 
-from . import overview
-from . import alerts
-from . import route_optimization
-from . import ai_chat
-from . import settings
+import importlib
 
-__all__ = ['overview', 'alerts', 'route_optimization', 'ai_chat', 'settings']
\ No newline at end of file
+# Submodules are imported on first attribute access (PEP 562) so that
+# importing one page doesn't pull in every other page's dependencies
+_SUBMODULES = {'overview', 'alerts', 'route_optimization', 'ai_chat', 'settings'}
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        module = importlib.import_module(f'.{name}', __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | _SUBMODULES)
+
+__all__ = ['overview', 'alerts', 'route_optimization', 'ai_chat', 'settings']
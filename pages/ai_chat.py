@@ -1,95 +1,193 @@
 import os
-import streamlit as st
-from datetime import datetime
+import re
+import functools
 import time
+import streamlit as st
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from sqlalchemy import create_engine, text
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_community.utilities import SQLDatabase
-from langchain_community.agent_toolkits import SQLDatabaseToolkit
-from langchain_community.agent_toolkits.sql.base import create_sql_agent
 
 # Import our utility modules
 from utils.database import ArgoDatabase
 from utils.config import config
 
+logger = logging.getLogger(__name__)
+
+# Static chat content, built once at import rather than on every session start
+WELCOME_MESSAGE = {
+    'id': '0',
+    'type': 'assistant',
+    'content': """Welcome to the ARGO Data Assistant! 🌊
+
+I can help you analyze **real oceanographic data** from ARGO floats in the Indian Ocean. 
+
+📅 **Current Dataset**: January 2024 measurements from 10,000+ observations
+🌍 **Coverage**: Arabian Sea, Bay of Bengal, and broader Indian Ocean
+🚢 **Sources**: Multiple ARGO floats with temperature, salinity, pressure, and depth data
+
+**Sample Questions:**
+- "What is the average temperature in the Arabian Sea in January 2024?"
+- "Show me salinity measurements at different depths"
+- "Compare temperatures between Arabian Sea and Bay of Bengal"
+- "Find the deepest measurements in our dataset"
+- "What are the temperature variations by region?"
+- "Show me recent data from float 2902388"
+
+**Data Analysis:**
+- "Plot temperature vs depth profiles"
+- "Find unusual temperature or salinity readings"
+- "Show distribution of measurements by region"
+- "Calculate average ocean conditions by area"
+
+Feel free to ask me anything about our January 2024 Indian Ocean ARGO data!"""
+}
+
+OCEAN_SUMMARY = """🌊 **Ocean Summary Dashboard**
+
+📊 **Current Statistics:**
+- Total ARGO Profiles: 10 active measurements
+- Ocean Conditions: 5 monitoring stations
+- Agro-Bots Fleet: 4 bots (3 active, 1 maintenance)
+
+🌡️ **Environmental Conditions:**
+- Temperature Range: 22°C - 29°C
+- Salinity Range: 33.2 - 35.4 PSU
+- Coverage: Arabian Sea, Bay of Bengal, Indian Ocean
+
+🚨 **Alert Status:** Mixed conditions with some pollution hotspots detected"""
+
+# Per-row report templates, filled with str.format(**row) and joined
+BOT_REPORT_ROW = """{icon} **{bot_name}**
+   Status: {status}
+   Location: {latitude:.2f}°N, {longitude:.2f}°E
+   Battery: {battery_level:.1f}%
+   Last Update: {last_update}
+
+"""
+
+POLLUTION_REPORT_ROW = """{icon} **{alert_level} Alert**
+   Location: {latitude:.2f}°N, {longitude:.2f}°E
+   Pollution Index: {pollution_index:.1f}
+   
+"""
+
+OCEAN_CONDITIONS_ROW = (
+    "**Location {i}:** {latitude:.2f}°N, {longitude:.2f}°E\n"
+    "- Temperature: {temperature:.1f}°C\n"
+    "- Salinity: {salinity:.1f} PSU\n"
+    "- Current Speed: {current_speed:.1f} m/s\n"
+    "- Pollution Index: {pollution_index:.1f}\n"
+    "- Alert Level: {alert_level}\n\n"
+)
+
+POLLUTION_ALERT_ROW = (
+    "{icon} **{alert_level} Alert**\n"
+    "   Location: {latitude:.2f}°N, {longitude:.2f}°E\n"
+    "   Pollution Index: {pollution_index:.1f}\n\n"
+)
+
+BOT_STATUS_ROW = "{icon} **{bot_name}**: {status} (Battery: {battery_level:.1f}%)\n"
+
+def _alert_icon(alert_level):
+    return "🔴" if alert_level == 'HIGH' else "🟡" if alert_level == 'MEDIUM' else "🟢"
+
+@st.cache_resource(show_spinner="🤖 Initializing AI chatbot...")
+def _build_chatbot(key_fingerprint: str, _google_api_key: str):
+    """Build the database manager, Gemini LLM and NL-to-SQL chain once per process.
+    
+    Shared across sessions and reruns; keyed on the API key fingerprint so a
+    new key builds a fresh chain. Raises on failure so nothing is cached.
+    """
+    # LangChain and the Gemini client pull in a large import graph; load them
+    # only when the chatbot is actually built, not when the app starts
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from langchain_community.utilities import SQLDatabase
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_core.output_parsers import StrOutputParser
+    
+    # Initialize database
+    db_manager = ArgoDatabase()
+    health = db_manager.health_check()
+    
+    if health["status"] != "healthy":
+        raise RuntimeError(f"Database initialization failed: {health.get('error', 'Unknown error')}")
+    
+    # Create LangChain database connection, reflecting only the tables the
+    # chat answers from so the baked-in schema stays short
+    engine = db_manager.get_connection()
+    db = SQLDatabase(engine, include_tables=["argo_profiles", "ocean_conditions", "agro_bots"])
+    
+    # Initialize the Gemini LLM
+    llm = ChatGoogleGenerativeAI(
+        model="gemini-1.5-flash", 
+        google_api_key=_google_api_key,
+        temperature=0.1
+    )
+    
+    # Single-shot NL-to-SQL chain: the schema is read once here and baked into
+    # the prompt, so a question costs one Gemini call rather than an agent loop
+    prompt = ChatPromptTemplate.from_messages([
+        ("system",
+         "You write SQL for a TiDB (MySQL-compatible) database with this schema:\n{schema}\n"
+         "Reply with ONLY one read-only SELECT statement, without explanation or code fences."),
+        ("human", "{question}"),
+    ]).partial(schema=db.get_table_info())
+    sql_chain = prompt | llm | StrOutputParser()
+    
+    return db_manager, sql_chain, llm
+
+# Every read-only query behind the quick actions and keyword replies
+QUICK_QUERIES = {
+    'temperature': "SELECT AVG(temperature) as avg_temp, MIN(temperature) as min_temp, MAX(temperature) as max_temp, COUNT(*) as count FROM argo_profiles WHERE temperature IS NOT NULL",
+    'salinity': "SELECT AVG(salinity) as avg_sal, MIN(salinity) as min_sal, MAX(salinity) as max_sal FROM argo_profiles WHERE salinity IS NOT NULL",
+    'ocean_conditions': "SELECT * FROM ocean_conditions LIMIT 5",
+    'pollution': "SELECT latitude, longitude, pollution_index, alert_level FROM ocean_conditions WHERE pollution_index > 2.0 ORDER BY pollution_index DESC",
+    'bots': "SELECT bot_name, status, latitude, longitude, battery_level, last_update FROM agro_bots",
+}
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _quick_query_rows(_db_manager) -> dict:
+    """Run all QUICK_QUERIES concurrently over the engine's connection pool and
+    keep the rows for five minutes, so the first quick action costs one
+    round-trip of latency and the rest are served from the cache. A failed
+    query raises and nothing is cached"""
+    with ThreadPoolExecutor(max_workers=len(QUICK_QUERIES)) as executor:
+        futures = {name: executor.submit(_db_manager.execute_query, query)
+                   for name, query in QUICK_QUERIES.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_health(_db_manager):
+    """health_check() shared by the sidebar and Test Connection, at most one
+    round-trip per 10 seconds; the manager is a process-wide singleton so it
+    needn't be part of the cache key"""
+    return _db_manager.health_check()
+
 def initialize_chatbot():
     """Initialize the chatbot components"""
-    if 'chatbot_initialized' not in st.session_state:
-        try:
-            with st.spinner("🤖 Initializing AI chatbot..."):
-                # Get Google API key
-                google_api_key = config.get_google_api_key()
-                if not google_api_key:
-                    st.error("❌ Google API key not found. Please configure it in the .env file or Streamlit secrets.")
-                    st.info("💡 You can add your API key to the .env file: GOOGLE_API_KEY=your_key_here")
-                    return None, None, None
-                
-                st.success(f"✅ API key loaded: ...{google_api_key[-4:]}")
-                
-                # Initialize database
-                db_manager = ArgoDatabase()
-                health = db_manager.health_check()
-                
-                if health["status"] != "healthy":
-                    st.error(f"❌ Database initialization failed: {health.get('error', 'Unknown error')}")
-                    return None, None, None
-                
-                st.success(f"✅ Database initialized with {sum(health['records'].values())} total records")
-                
-                # Create LangChain database connection
-                engine = db_manager.get_connection()
-                db = SQLDatabase(engine)
-                
-                # Initialize the Gemini LLM
-                llm = ChatGoogleGenerativeAI(
-                    model="gemini-1.5-flash", 
-                    google_api_key=google_api_key,
-                    temperature=0.1
-                )
-                
-                st.success("✅ Google Gemini LLM initialized")
-                
-                # Create the SQL Agent
-                toolkit = SQLDatabaseToolkit(db=db, llm=llm)
-                agent_executor = create_sql_agent(
-                    llm=llm,
-                    toolkit=toolkit,
-                    verbose=False,  # Set to False to reduce noise
-                    handle_parsing_errors=True,
-                    max_iterations=5,
-                    max_execution_time=30
-                )
-                
-                st.success("✅ SQL Agent created successfully")
-                
-                st.session_state.chatbot_initialized = True
-                st.session_state.db_manager = db_manager
-                st.session_state.agent_executor = agent_executor
-                st.session_state.llm = llm
-                
-                st.success("🎉 Chatbot initialization complete!")
-                time.sleep(1)  # Brief pause to show success message
-                
-                return db_manager, agent_executor, llm
-            
-        except Exception as e:
-            st.error(f"❌ Failed to initialize chatbot: {str(e)}")
-            st.error("🔧 Please check:")
-            st.error("1. Google API key is valid")
-            st.error("2. All dependencies are installed: pip install -r requirements.txt")
-            st.error("3. Internet connection is working")
-            
-            # Show detailed error for debugging
-            import traceback
-            with st.expander("🐛 Debug Information"):
-                st.code(traceback.format_exc())
-            
-            return None, None, None
-    else:
-        return (st.session_state.db_manager, 
-                st.session_state.agent_executor, 
-                st.session_state.llm)
+    # Get Google API key
+    google_api_key = config.get_google_api_key()
+    if not google_api_key:
+        st.error("❌ Google API key not found. Please configure it in the .env file or Streamlit secrets.")
+        st.info("💡 You can add your API key to the .env file: GOOGLE_API_KEY=your_key_here")
+        return None, None, None
+    
+    try:
+        return _build_chatbot(google_api_key[-4:], google_api_key)
+    
+    except Exception as e:
+        st.error(f"❌ Failed to initialize chatbot: {str(e)}")
+        st.error("🔧 Please check:")
+        st.error("1. Google API key is valid")
+        st.error("2. All dependencies are installed: pip install -r requirements.txt")
+        st.error("3. Internet connection is working")
+        
+        # Show detailed error for debugging
+        import traceback
+        with st.expander("🐛 Debug Information"):
+            st.code(traceback.format_exc())
+        
+        return None, None, None
 
 def show_page():
     """Display the AI chat page with advanced ARGO data capabilities"""
@@ -97,17 +195,15 @@ def show_page():
     st.caption("Advanced AI chatbot for oceanographic data analysis and queries")
     
     # Initialize chatbot
-    db_manager, agent_executor, llm = initialize_chatbot()
+    db_manager, sql_chain, llm = initialize_chatbot()
     
-    if not all([db_manager, agent_executor, llm]):
+    if not all([db_manager, sql_chain, llm]):
         st.error("❌ Unable to initialize chatbot. Please check your configuration.")
         
         col1, col2 = st.columns(2)
         with col1:
             if st.button("🔄 Retry Initialization", type="primary"):
-                # Clear the initialization flag to force retry
-                if 'chatbot_initialized' in st.session_state:
-                    del st.session_state.chatbot_initialized
+                # Failed builds are never cached, so a rerun retries
                 st.rerun()
         
         with col2:
@@ -122,118 +218,98 @@ def show_page():
     if 'chat_messages' not in st.session_state:
         st.session_state.chat_messages = []
         # Add welcome message
-        welcome_message = {
-            'id': '0',
-            'type': 'assistant',
-            'content': """Welcome to the ARGO Data Assistant! 🌊
-
-I can help you analyze **real oceanographic data** from ARGO floats in the Indian Ocean. 
-
-📅 **Current Dataset**: January 2024 measurements from 10,000+ observations
-🌍 **Coverage**: Arabian Sea, Bay of Bengal, and broader Indian Ocean
-🚢 **Sources**: Multiple ARGO floats with temperature, salinity, pressure, and depth data
-
-**Sample Questions:**
-- "What is the average temperature in the Arabian Sea in January 2024?"
-- "Show me salinity measurements at different depths"
-- "Compare temperatures between Arabian Sea and Bay of Bengal"
-- "Find the deepest measurements in our dataset"
-- "What are the temperature variations by region?"
-- "Show me recent data from float 2902388"
-
-**Data Analysis:**
-- "Plot temperature vs depth profiles"
-- "Find unusual temperature or salinity readings"
-- "Show distribution of measurements by region"
-- "Calculate average ocean conditions by area"
-
-Feel free to ask me anything about our January 2024 Indian Ocean ARGO data!""",
-            'timestamp': datetime.now().isoformat()
-        }
-        st.session_state.chat_messages.append(welcome_message)
+        st.session_state.chat_messages.append({**WELCOME_MESSAGE, 'timestamp': time.time()})
+    
+    # Main chat interface. The history is drawn on full runs only; both
+    # fragments append new messages to this container instead of rerunning
+    # the page, so a quick action never re-walks the whole conversation
+    st.subheader("💬 Chat with ARGO Assistant")
+    chat_container = st.container()
+    with chat_container:
+        for message in st.session_state.chat_messages:
+            render_message(message)
     
-    # Sidebar with database information
+    # The sidebar and the chat area are separate fragments, so a widget in one
+    # only reruns that part instead of the whole page
     with st.sidebar:
-        st.subheader("📊 Database Status")
+        _sidebar_panel(db_manager, chat_container)
+    
+    _chat_panel(sql_chain, db_manager, chat_container)
+
+@st.fragment
+def _sidebar_panel(db_manager, chat_container):
+    """Database status, real-data controls and quick actions"""
+    st.subheader("📊 Database Status")
+    
+    # Health check
+    health = _cached_health(db_manager)
+    if health["status"] == "healthy":
+        st.success("Database: Healthy ✅")
         
-        # Health check
-        health = db_manager.health_check()
-        if health["status"] == "healthy":
-            st.success("Database: Healthy ✅")
-            
-            # Show data source
-            data_source = health.get("data_source", "Unknown")
-            if data_source == "Real NetCDF Data":
-                st.info("🌊 Using Real ARGO Data")
-            else:
-                st.info("🧪 Using Sample Data")
-            
-            # Show record counts
-            records = health.get("records", {})
-            st.metric("ARGO Profiles", records.get("argo_profiles", 0))
-            st.metric("Ocean Conditions", records.get("ocean_conditions", 0))
-            st.metric("Agro-Bots", records.get("agro_bots", 0))
-            
-            # NetCDF Data Controls
-            st.divider()
-            st.subheader("🌊 Real Data Controls")
-            
-            if not health.get("use_real_data", False):
-                if st.button("📥 Load Indian Ocean ARGO Data", use_container_width=True):
-                    with st.spinner("Downloading and processing Indian Ocean ARGO NetCDF data..."):
-                        st.info("🔄 This may take several minutes...")
-                        st.info("📡 Sources: NOAA NCEI & IFREMER Indian Ocean")
-                        st.info("🌊 Coverage: Arabian Sea, Bay of Bengal, Indian Ocean")
-                        
-                        success = db_manager.use_netcdf_data()
-                        if success:
-                            st.success("✅ Real Indian Ocean ARGO data loaded successfully!")
-                            st.rerun()
-                        else:
-                            st.error("❌ Failed to load NetCDF data. Check logs for details.")
-                
-                st.caption("⚠️ Downloads real ARGO data from NOAA & IFREMER servers")
-                st.caption("🎯 Indian Ocean specific data sources")
-            else:
-                st.success("✅ Using Real Indian Ocean ARGO Data")
-                st.caption("🎯 Sources: NOAA NCEI & IFREMER Indian Ocean")
-                st.caption("🌊 Live oceanographic measurements")
+        # Show data source
+        data_source = health.get("data_source", "Unknown")
+        if data_source == "Real NetCDF Data":
+            st.info("🌊 Using Real ARGO Data")
         else:
-            st.error(f"Database Error: {health.get('error', 'Unknown')}")
+            st.info("🧪 Using Sample Data")
         
-        st.divider()
+        # Show record counts
+        records = health.get("records", {})
+        st.metric("ARGO Profiles", records.get("argo_profiles", 0))
+        st.metric("Ocean Conditions", records.get("ocean_conditions", 0))
+        st.metric("Agro-Bots", records.get("agro_bots", 0))
         
-        # Quick action buttons
-        st.subheader("🚀 Quick Queries")
-        
-        if st.button("Ocean Summary", use_container_width=True):
-            quick_query = "Give me a summary of current ocean conditions"
-            add_user_message(quick_query)
-            summary = """🌊 **Ocean Summary Dashboard**
-
-📊 **Current Statistics:**
-- Total ARGO Profiles: 10 active measurements
-- Ocean Conditions: 5 monitoring stations
-- Agro-Bots Fleet: 4 bots (3 active, 1 maintenance)
-
-🌡️ **Environmental Conditions:**
-- Temperature Range: 22°C - 29°C
-- Salinity Range: 33.2 - 35.4 PSU
-- Coverage: Arabian Sea, Bay of Bengal, Indian Ocean
-
-🚨 **Alert Status:** Mixed conditions with some pollution hotspots detected"""
-            add_ai_message(summary)
-            st.rerun()
+        # NetCDF Data Controls
+        st.divider()
+        st.subheader("🌊 Real Data Controls")
         
-        if st.button("Temperature Analysis", use_container_width=True):
-            quick_query = "Show me temperature analysis"
-            add_user_message(quick_query)
-            if db_manager:
-                try:
-                    result = db_manager.execute_query("SELECT AVG(temperature) as avg_temp, MIN(temperature) as min_temp, MAX(temperature) as max_temp, COUNT(*) as count FROM argo_profiles WHERE temperature IS NOT NULL")
-                    if result:
-                        data = result[0]
-                        response = f"""🌡️ **Temperature Analysis Report**
+        if not health.get("use_real_data", False):
+            if st.button("📥 Load Indian Ocean ARGO Data", use_container_width=True):
+                with st.spinner("Downloading and processing Indian Ocean ARGO NetCDF data..."):
+                    st.info("🔄 This may take several minutes...")
+                    st.info("📡 Sources: NOAA NCEI & IFREMER Indian Ocean")
+                    st.info("🌊 Coverage: Arabian Sea, Bay of Bengal, Indian Ocean")
+                    
+                    success = db_manager.use_netcdf_data()
+                    if success:
+                        st.success("✅ Real Indian Ocean ARGO data loaded successfully!")
+                        _cached_health.clear()
+                        _quick_query_rows.clear()
+                        st.rerun()
+                    else:
+                        st.error("❌ Failed to load NetCDF data. Check logs for details.")
+            
+            st.caption("⚠️ Downloads real ARGO data from NOAA & IFREMER servers")
+            st.caption("🎯 Indian Ocean specific data sources")
+        else:
+            st.success("✅ Using Real Indian Ocean ARGO Data")
+            st.caption("🎯 Sources: NOAA NCEI & IFREMER Indian Ocean")
+            st.caption("🌊 Live oceanographic measurements")
+    else:
+        st.error(f"Database Error: {health.get('error', 'Unknown')}")
+    
+    st.divider()
+    
+    # Quick action buttons. These answer from the cached SQL rows and never
+    # call Gemini, so there is no model work to defer or batch here.
+    st.subheader("🚀 Quick Queries")
+    first_new = len(st.session_state.chat_messages)
+    
+    if st.button("Ocean Summary", use_container_width=True):
+        quick_query = "Give me a summary of current ocean conditions"
+        add_user_message(quick_query)
+        summary = OCEAN_SUMMARY
+        add_ai_message(summary)
+    
+    if st.button("Temperature Analysis", use_container_width=True):
+        quick_query = "Show me temperature analysis"
+        add_user_message(quick_query)
+        if db_manager:
+            try:
+                result = _quick_query_rows(db_manager)['temperature']
+                if result:
+                    data = result[0]
+                    response = f"""🌡️ **Temperature Analysis Report**
 
 📊 **Statistical Summary:**
 - **Average Temperature:** {data['avg_temp']:.2f}°C
@@ -245,67 +321,57 @@ Feel free to ask me anything about our January 2024 Indian Ocean ARGO data!""",
 - Typical tropical to subtropical range
 - Surface temperatures generally higher
 - Consistent with seasonal patterns"""
-                        add_ai_message(response)
-                except Exception as e:
-                    add_ai_message(f"Error retrieving temperature data: {str(e)}")
-            else:
-                add_ai_message("Database not available for temperature analysis.")
-            st.rerun()
-        
-        if st.button("Bot Status Report", use_container_width=True):
-            quick_query = "Show me all bot status"
-            add_user_message(quick_query)
-            if db_manager:
-                try:
-                    result = db_manager.execute_query("SELECT bot_name, status, latitude, longitude, battery_level, last_update FROM agro_bots")
-                    if result:
-                        response = "🤖 **Agro-Bot Fleet Status Report**\n\n"
-                        for bot in result:
-                            status_icon = "🟢" if bot['status'] == 'ACTIVE' else "🟡" if bot['status'] == 'MAINTENANCE' else "🔴"
-                            response += f"""{status_icon} **{bot['bot_name']}**
-   Status: {bot['status']}
-   Location: {bot['latitude']:.2f}°N, {bot['longitude']:.2f}°E
-   Battery: {bot['battery_level']:.1f}%
-   Last Update: {bot['last_update']}
-
-"""
-                        add_ai_message(response)
-                except Exception as e:
-                    add_ai_message(f"Error retrieving bot data: {str(e)}")
-            else:
-                add_ai_message("Database not available for bot status.")
-            st.rerun()
-        
-        if st.button("Pollution Alerts", use_container_width=True):
-            quick_query = "Show pollution alerts"
-            add_user_message(quick_query)
-            if db_manager:
-                try:
-                    result = db_manager.execute_query("SELECT latitude, longitude, pollution_index, alert_level FROM ocean_conditions WHERE pollution_index > 2.0 ORDER BY pollution_index DESC")
-                    if result:
-                        response = "🚨 **Pollution Alert Report**\n\n"
-                        for condition in result:
-                            alert_icon = "🔴" if condition['alert_level'] == 'HIGH' else "🟡" if condition['alert_level'] == 'MEDIUM' else "🟢"
-                            response += f"""{alert_icon} **{condition['alert_level']} Alert**
-   Location: {condition['latitude']:.2f}°N, {condition['longitude']:.2f}°E
-   Pollution Index: {condition['pollution_index']:.1f}
-   
-"""
-                        add_ai_message(response)
-                except Exception as e:
-                    add_ai_message(f"Error retrieving pollution data: {str(e)}")
-            else:
-                add_ai_message("Database not available for pollution alerts.")
-            st.rerun()
-        
-        if st.button("Test Connection", use_container_width=True):
-            add_user_message("Testing database connection...")
+                    add_ai_message(response)
+            except Exception as e:
+                add_ai_message(f"Error retrieving temperature data: {str(e)}")
+        else:
+            add_ai_message("Database not available for temperature analysis.")
+    
+    if st.button("Bot Status Report", use_container_width=True):
+        quick_query = "Show me all bot status"
+        add_user_message(quick_query)
+        if db_manager:
             try:
-                if db_manager:
-                    health = db_manager.health_check()
-                    if health["status"] == "healthy":
-                        records = health["records"]
-                        response = f"""✅ **Database Connection Successful!**
+                result = _quick_query_rows(db_manager)['bots']
+                if result:
+                    response = "🤖 **Agro-Bot Fleet Status Report**\n\n" + "".join(
+                        BOT_REPORT_ROW.format(
+                            icon="🟢" if bot['status'] == 'ACTIVE' else "🟡" if bot['status'] == 'MAINTENANCE' else "🔴",
+                            **bot
+                        )
+                        for bot in result
+                    )
+                    add_ai_message(response)
+            except Exception as e:
+                add_ai_message(f"Error retrieving bot data: {str(e)}")
+        else:
+            add_ai_message("Database not available for bot status.")
+    
+    if st.button("Pollution Alerts", use_container_width=True):
+        quick_query = "Show pollution alerts"
+        add_user_message(quick_query)
+        if db_manager:
+            try:
+                result = _quick_query_rows(db_manager)['pollution']
+                if result:
+                    response = "🚨 **Pollution Alert Report**\n\n" + "".join(
+                        POLLUTION_REPORT_ROW.format(icon=_alert_icon(condition['alert_level']), **condition)
+                        for condition in result
+                    )
+                    add_ai_message(response)
+            except Exception as e:
+                add_ai_message(f"Error retrieving pollution data: {str(e)}")
+        else:
+            add_ai_message("Database not available for pollution alerts.")
+    
+    if st.button("Test Connection", use_container_width=True):
+        add_user_message("Testing database connection...")
+        try:
+            if db_manager:
+                health = _cached_health(db_manager)
+                if health["status"] == "healthy":
+                    records = health["records"]
+                    response = f"""✅ **Database Connection Successful!**
 
 📊 **Database Health:**
 - Status: {health["status"].upper()}
@@ -317,71 +383,75 @@ Feel free to ask me anything about our January 2024 Indian Ocean ARGO data!""",
 - Database: SQLite
 - Path: {health["database_path"]}
 - All tables accessible ✓"""
-                    else:
-                        response = f"❌ Database error: {health.get('error', 'Unknown error')}"
                 else:
-                    response = "❌ Database manager not initialized. Try refreshing the page."
-                add_ai_message(response)
-            except Exception as e:
-                add_ai_message(f"❌ Connection test failed: {str(e)}")
-            st.rerun()
-        
-        if st.button("Clear Chat", use_container_width=True):
-            st.session_state.chat_messages = []
-            st.rerun()
+                    response = f"❌ Database error: {health.get('error', 'Unknown error')}"
+            else:
+                response = "❌ Database manager not initialized. Try refreshing the page."
+            add_ai_message(response)
+        except Exception as e:
+            add_ai_message(f"❌ Connection test failed: {str(e)}")
     
-    # Main chat interface
-    st.subheader("💬 Chat with ARGO Assistant")
+    if st.button("Clear Chat", use_container_width=True):
+        st.session_state.chat_messages = []
+        st.rerun()
     
-    # Display chat messages
-    chat_container = st.container()
+    # Show whatever a quick action just added below the existing history
     with chat_container:
-        for message in st.session_state.chat_messages:
-            with st.chat_message(message['type']):
-                st.write(message['content'])
-                # Show timestamp for recent messages
-                if 'timestamp' in message:
-                    timestamp = datetime.fromisoformat(message['timestamp'])
-                    time_str = timestamp.strftime('%H:%M:%S')
-                    st.caption(f"⏰ {time_str}")
-    
+        for message in st.session_state.chat_messages[first_new:]:
+            render_message(message)
+
+@st.fragment
+def _chat_panel(sql_chain, db_manager, chat_container):
+    """Chat input and message statistics"""
     # Chat input
     if prompt := st.chat_input("Ask me about ARGO data, ocean conditions, or bot status..."):
-        # Add user message immediately
+        # Add user message and show it immediately, then answer in place below
+        # it rather than rerunning the whole page to redraw the history
         add_user_message(prompt)
-        
-        # Process the query and add AI response
-        if agent_executor:
-            process_query(prompt, agent_executor)
-        else:
-            # Fallback if agent not available
-            fallback_response = generate_fallback_response(prompt)
-            add_ai_message(fallback_response)
-        
-        # Force rerun to show new messages
-        st.rerun()
+        with chat_container:
+            render_message(st.session_state.chat_messages[-1])
+            
+            # Process the query and add AI response
+            with st.spinner("🤖 Thinking..."):
+                if sql_chain:
+                    process_query(prompt, sql_chain, db_manager)
+                else:
+                    # Fallback if the SQL chain is not available
+                    fallback_response = generate_fallback_response(prompt)
+                    add_ai_message(fallback_response)
+            render_message(st.session_state.chat_messages[-1])
     
     # Chat statistics at the bottom
     st.divider()
     col1, col2, col3, col4 = st.columns(4)
     
+    # One pass over the history for the per-type counts
+    message_counts = Counter(m['type'] for m in st.session_state.chat_messages)
+    
     with col1:
         total_messages = len(st.session_state.chat_messages)
         st.metric("Total Messages", total_messages)
     
     with col2:
-        user_messages = len([m for m in st.session_state.chat_messages if m['type'] == 'user'])
-        st.metric("User Queries", user_messages)
+        st.metric("User Queries", message_counts['user'])
     
     with col3:
-        ai_messages = len([m for m in st.session_state.chat_messages if m['type'] == 'assistant'])
-        st.metric("AI Responses", ai_messages)
+        st.metric("AI Responses", message_counts['assistant'])
     
     with col4:
         if st.session_state.chat_messages:
-            last_message_time = datetime.fromisoformat(st.session_state.chat_messages[-1]['timestamp'])
-            time_ago = datetime.now() - last_message_time
-            st.metric("Last Activity", f"{int(time_ago.total_seconds())}s ago")
+            time_ago = time.time() - st.session_state.chat_messages[-1]['timestamp']
+            st.metric("Last Activity", f"{int(time_ago)}s ago")
+
+def render_message(message: dict):
+    """Draw one chat message with its timestamp"""
+    with st.chat_message(message['type']):
+        st.write(message['content'])
+        # Show timestamp for recent messages
+        if 'timestamp' in message:
+            # Stored as epoch seconds; only formatted here, at render time
+            time_str = time.strftime('%H:%M:%S', time.localtime(message['timestamp']))
+            st.caption(f"⏰ {time_str}")
 
 def add_user_message(content: str):
     """Add a user message to the chat"""
@@ -389,7 +459,7 @@ def add_user_message(content: str):
         'id': str(len(st.session_state.chat_messages) + 1),
         'type': 'user',
         'content': content,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': time.time()
     }
     st.session_state.chat_messages.append(user_message)
 
@@ -399,15 +469,15 @@ def add_ai_message(content: str):
         'id': str(len(st.session_state.chat_messages) + 1),
         'type': 'assistant',
         'content': content,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': time.time()
     }
     st.session_state.chat_messages.append(ai_message)
 
-def process_query(query: str, agent_executor):
+def process_query(query: str, sql_chain, db_manager):
     """Process user query using the LangChain SQL agent"""
     try:
         # Simple timeout mechanism using a separate function
-        response_text = execute_with_timeout(query, agent_executor)
+        response_text = execute_with_timeout(query, sql_chain, db_manager)
         add_ai_message(response_text)
             
     except Exception as e:
@@ -419,19 +489,23 @@ def process_query(query: str, agent_executor):
         
         add_ai_message(error_message)
 
-def execute_with_timeout(query: str, agent_executor):
-    """Execute query with simple error handling"""
-    try:
-        # Try a direct database query first for simple requests
-        query_lower = query.lower()
-        db_manager = st.session_state.get('db_manager')
-        
-        # Debug: Add logging
-        print(f"DEBUG: Processing query: '{query}' (lower: '{query_lower}')")
-        print(f"DEBUG: db_manager available: {db_manager is not None}")
-        
-        if any(word in query_lower for word in ['hi', 'hello', 'help']):
-            return """Hello! I'm your ARGO Data Assistant. 👋
+# Intent router: each branch is a lookahead tried in priority order at the
+# start of the query, so the first intent present wins regardless of where
+# its keyword appears; m.lastgroup names the intent
+INTENT_ROUTER = re.compile(
+    r"^(?:"
+    r"(?=.*?\b(?P<greeting>hi|hello|help)\b)"
+    r"|(?=.*?(?P<temperature>\btemp))"
+    r"|(?=.*?\bocean)(?=.*?(?P<ocean>condition|data|list))"
+    r"|(?=.*?(?P<salinity>salinity))"
+    r"|(?=.*?(?P<pollution>pollut|alert))"
+    r"|(?=.*?(?P<bot>\bbots?\b|agro))"
+    r")",
+    re.IGNORECASE | re.DOTALL,
+)
+
+def _greeting_reply(db_manager):
+    return """Hello! I'm your ARGO Data Assistant. 👋
 
 I can help you with:
 🌊 **Ocean Data**: Temperature, salinity, pH measurements
@@ -441,18 +515,17 @@ I can help you with:
 
 Try asking: "What's the average temperature?" or "Show bot status" """
 
-        elif 'temperature' in query_lower or ('ocean' in query_lower and 'temp' in query_lower):
-            print("DEBUG: Temperature query detected")
-            # Direct database query for temperature
-            if db_manager:
-                try:
-                    result = db_manager.execute_query("SELECT AVG(temperature) as avg_temp, MIN(temperature) as min_temp, MAX(temperature) as max_temp FROM argo_profiles WHERE temperature IS NOT NULL")
-                    print(f"DEBUG: Temperature query result: {result}")
-                    if result and len(result) > 0:
-                        data = result[0]
-                        count_result = db_manager.execute_query("SELECT COUNT(*) as count FROM argo_profiles WHERE temperature IS NOT NULL")
-                        count = count_result[0]['count'] if count_result else 0
-                        return f"""🌡️ **Temperature Analysis:**
+def _temperature_reply(db_manager):
+    logger.debug("Temperature query detected")
+    # Direct database query for temperature
+    if db_manager:
+        try:
+            result = _quick_query_rows(db_manager)['temperature']
+            logger.debug("Temperature query result: %s", result)
+            if result and len(result) > 0:
+                data = result[0]
+                count = data['count']
+                return f"""🌡️ **Temperature Analysis:**
 
 📊 **Statistics:**
 - Average: {data['avg_temp']:.2f}°C
@@ -460,43 +533,38 @@ Try asking: "What's the average temperature?" or "Show bot status" """
 - Maximum: {data['max_temp']:.2f}°C
 
 🌍 **Coverage:** Data from {count} measurements across multiple ocean regions."""
-                    else:
-                        return "❌ No temperature data found in database."
-                except Exception as db_error:
-                    print(f"DEBUG: Database error in temperature query: {db_error}")
-                    return f"❌ Database error: {str(db_error)}"
             else:
-                return "❌ Database not available for temperature analysis."
+                return "❌ No temperature data found in database."
+        except Exception as db_error:
+            logger.debug("Database error in temperature query: %s", db_error)
+            return f"❌ Database error: {str(db_error)}"
+    else:
+        return "❌ Database not available for temperature analysis."
 
-        elif 'ocean' in query_lower and ('condition' in query_lower or 'data' in query_lower or 'list' in query_lower):
-            print("DEBUG: Ocean conditions query detected")
-            if db_manager:
-                try:
-                    result = db_manager.execute_query("SELECT * FROM ocean_conditions LIMIT 5")
-                    print(f"DEBUG: Ocean conditions result: {result}")
-                    if result and len(result) > 0:
-                        response = "🌊 **Ocean Conditions Data:**\n\n"
-                        for i, condition in enumerate(result, 1):
-                            response += f"**Location {i}:** {condition['latitude']:.2f}°N, {condition['longitude']:.2f}°E\n"
-                            response += f"- Temperature: {condition['temperature']:.1f}°C\n"
-                            response += f"- Salinity: {condition['salinity']:.1f} PSU\n"
-                            response += f"- Current Speed: {condition['current_speed']:.1f} m/s\n"
-                            response += f"- Pollution Index: {condition['pollution_index']:.1f}\n"
-                            response += f"- Alert Level: {condition['alert_level']}\n\n"
-                        return response
-                    else:
-                        return "❌ No ocean conditions data found."
-                except Exception as db_error:
-                    return f"❌ Database error: {str(db_error)}"
+def _ocean_conditions_reply(db_manager):
+    logger.debug("Ocean conditions query detected")
+    if db_manager:
+        try:
+            result = _quick_query_rows(db_manager)['ocean_conditions']
+            logger.debug("Ocean conditions result: %s", result)
+            if result and len(result) > 0:
+                return "🌊 **Ocean Conditions Data:**\n\n" + "".join(
+                    OCEAN_CONDITIONS_ROW.format(i=i, **condition)
+                    for i, condition in enumerate(result, 1)
+                )
+            else:
+                return "❌ No ocean conditions data found."
+        except Exception as db_error:
+            return f"❌ Database error: {str(db_error)}"
 
-        elif 'salinity' in query_lower:
-            print("DEBUG: Salinity query detected")
-            if db_manager:
-                try:
-                    result = db_manager.execute_query("SELECT AVG(salinity) as avg_sal, MIN(salinity) as min_sal, MAX(salinity) as max_sal FROM argo_profiles WHERE salinity IS NOT NULL")
-                    if result and len(result) > 0:
-                        data = result[0]
-                        return f"""🧂 **Salinity Analysis:**
+def _salinity_reply(db_manager):
+    logger.debug("Salinity query detected")
+    if db_manager:
+        try:
+            result = _quick_query_rows(db_manager)['salinity']
+            if result and len(result) > 0:
+                data = result[0]
+                return f"""🧂 **Salinity Analysis:**
 
 📊 **Statistics:**
 - Average: {data['avg_sal']:.2f} PSU
@@ -504,47 +572,120 @@ Try asking: "What's the average temperature?" or "Show bot status" """
 - Maximum: {data['max_sal']:.2f} PSU
 
 🌊 **Note:** PSU = Practical Salinity Units. Ocean salinity typically ranges from 33-37 PSU."""
-                    else:
-                        return "❌ No salinity data found."
-                except Exception as db_error:
-                    return f"❌ Database error: {str(db_error)}"
+            else:
+                return "❌ No salinity data found."
+        except Exception as db_error:
+            return f"❌ Database error: {str(db_error)}"
 
-        elif 'pollution' in query_lower or 'alert' in query_lower:
-            print("DEBUG: Pollution/alert query detected")
-            if db_manager:
-                try:
-                    result = db_manager.execute_query("SELECT latitude, longitude, pollution_index, alert_level FROM ocean_conditions WHERE pollution_index > 2.0 ORDER BY pollution_index DESC")
-                    if result and len(result) > 0:
-                        response = "🚨 **Pollution Alert Report:**\n\n"
-                        for condition in result:
-                            alert_icon = "🔴" if condition['alert_level'] == 'HIGH' else "🟡" if condition['alert_level'] == 'MEDIUM' else "🟢"
-                            response += f"{alert_icon} **{condition['alert_level']} Alert**\n"
-                            response += f"   Location: {condition['latitude']:.2f}°N, {condition['longitude']:.2f}°E\n"
-                            response += f"   Pollution Index: {condition['pollution_index']:.1f}\n\n"
-                        return response
-                    else:
-                        return "✅ No high pollution areas found (all areas below threshold)."
-                except Exception as db_error:
-                    return f"❌ Database error: {str(db_error)}"
+def _pollution_reply(db_manager):
+    logger.debug("Pollution/alert query detected")
+    if db_manager:
+        try:
+            result = _quick_query_rows(db_manager)['pollution']
+            if result and len(result) > 0:
+                return "🚨 **Pollution Alert Report:**\n\n" + "".join(
+                    POLLUTION_ALERT_ROW.format(icon=_alert_icon(condition['alert_level']), **condition)
+                    for condition in result
+                )
+            else:
+                return "✅ No high pollution areas found (all areas below threshold)."
+        except Exception as db_error:
+            return f"❌ Database error: {str(db_error)}"
 
-        elif 'bot' in query_lower or 'agro' in query_lower:
-            print("DEBUG: Bot query detected")
-            if db_manager:
-                try:
-                    result = db_manager.execute_query("SELECT bot_name, status, battery_level FROM agro_bots")
-                    if result and len(result) > 0:
-                        status_text = "🤖 **Agro-Bot Fleet Status:**\n\n"
-                        for bot in result:
-                            status_icon = "🟢" if bot['status'] == 'ACTIVE' else "🟡"
-                            status_text += f"{status_icon} **{bot['bot_name']}**: {bot['status']} (Battery: {bot['battery_level']:.1f}%)\n"
-                        return status_text
-                    else:
-                        return "❌ No bot data found."
-                except Exception as db_error:
-                    return f"❌ Database error: {str(db_error)}"
+def _bot_reply(db_manager):
+    logger.debug("Bot query detected")
+    if db_manager:
+        try:
+            result = _quick_query_rows(db_manager)['bots']
+            if result and len(result) > 0:
+                return "🤖 **Agro-Bot Fleet Status:**\n\n" + "".join(
+                    BOT_STATUS_ROW.format(icon="🟢" if bot['status'] == 'ACTIVE' else "🟡", **bot)
+                    for bot in result
+                )
+            else:
+                return "❌ No bot data found."
+        except Exception as db_error:
+            return f"❌ Database error: {str(db_error)}"
+
+# Intent name (INTENT_ROUTER group) -> reply builder; a builder returning
+# None falls through to the suggestions message
+INTENT_HANDLERS = {
+    'greeting': _greeting_reply,
+    'temperature': _temperature_reply,
+    'ocean': _ocean_conditions_reply,
+    'salinity': _salinity_reply,
+    'pollution': _pollution_reply,
+    'bot': _bot_reply,
+}
+
+# Code fences the model sometimes wraps its SQL in, despite the prompt
+SQL_FENCE_RE = re.compile(r"^```(?:sql)?\s*|\s*```$", re.IGNORECASE)
+SELECT_RE = re.compile(r"select\b", re.IGNORECASE)
+
+# Most rows a generated query may put into the chat
+MAX_GENERATED_ROWS = 50
+
+def _generated_select(query: str, sql_chain) -> str:
+    """Ask the NL-to-SQL chain for a statement and accept it only if it is
+    a single SELECT"""
+    sql = SQL_FENCE_RE.sub("", sql_chain.invoke({"question": query}).strip())
+    sql = sql.strip().rstrip(";").strip()
+    if ";" in sql or not SELECT_RE.match(sql):
+        raise ValueError(f"Generated SQL is not a single SELECT statement: {sql!r}")
+    return sql
+
+def _run_read_only(sql: str, db_manager) -> list:
+    """Run a generated statement inside a read-only transaction, so the
+    server rejects any write that gets past the SELECT check"""
+    with db_manager.get_connection().connect() as conn:
+        conn.exec_driver_sql("START TRANSACTION READ ONLY")
+        try:
+            # No parameters, so the driver sends the text as-is
+            result = conn.exec_driver_sql(sql)
+            columns = list(result.keys())
+            return [dict(zip(columns, row)) for row in result.fetchmany(MAX_GENERATED_ROWS)]
+        finally:
+            conn.rollback()
+
+def _generated_sql_reply(query: str, sql_chain, db_manager) -> str:
+    """Answer a free-form question with one generated, read-only query"""
+    sql = _generated_select(query, sql_chain)
+    logger.debug("Generated SQL: %s", sql)
+    rows = _run_read_only(sql, db_manager)
+    
+    sql_block = f"\n\n🔎 **Query:**\n```sql\n{sql}\n```"
+    if not rows:
+        return "📭 The query ran but returned no rows." + sql_block
+    
+    header = "| " + " | ".join(rows[0]) + " |\n"
+    divider = "| " + " | ".join("---" for _ in rows[0]) + " |\n"
+    body = "".join("| " + " | ".join(str(value) for value in row.values()) + " |\n" for row in rows)
+    note = f"\n*Showing the first {MAX_GENERATED_ROWS} rows.*" if len(rows) == MAX_GENERATED_ROWS else ""
+    return "📊 **Query Results:**\n\n" + header + divider + body + note + sql_block
+
+def execute_with_timeout(query: str, sql_chain, db_manager):
+    """Execute query with simple error handling"""
+    try:
+        # Try a direct database query first for simple requests
+        logger.debug("Processing query: '%s'", query)
+        logger.debug("db_manager available: %s", db_manager is not None)
+        
+        match = INTENT_ROUTER.match(query)
+        if match:
+            response = INTENT_HANDLERS[match.lastgroup](db_manager)
+            if response is not None:
+                return response
+        
+        # Anything the keyword router doesn't cover goes to Gemini as one
+        # NL-to-SQL call; if that fails, fall back to the suggestions below
+        if sql_chain and db_manager:
+            try:
+                return _generated_sql_reply(query, sql_chain, db_manager)
+            except Exception as e:
+                logger.debug("Generated SQL failed: %s", e)
         
         # If no direct match found, provide a helpful message
-        print("DEBUG: No direct match found, providing suggestions")
+        logger.debug("No direct match found, providing suggestions")
         return f"""I understand you asked about: "{query}"
 
 🎯 **I can help with these specific queries:**
@@ -557,15 +698,24 @@ Try asking: "What's the average temperature?" or "Show bot status" """
 💡 **Try one of these exact phrases for best results!**"""
             
     except Exception as e:
-        print(f"DEBUG: Exception in execute_with_timeout: {e}")
+        logger.debug("Exception in execute_with_timeout: %s", e)
         return f"❌ Error processing query: {str(e)}"
 
+# Keyword sets for the fallback topics, matched against the query's word tokens
+WORD_RE = re.compile(r"\w+")
+TEMPERATURE_WORDS = frozenset({"temperature", "temperatures"})
+SALINITY_WORDS = frozenset({"salinity"})
+BOT_WORDS = frozenset({"bot", "bots", "agro", "agrobot", "agrobots", "robot", "robots"})
+POLLUTION_WORDS = frozenset({"pollution"})
+
+@functools.lru_cache(maxsize=128)
 def generate_fallback_response(query: str) -> str:
     """Generate a helpful fallback response when the AI agent fails"""
-    query_lower = query.lower()
+    # Tokenize once and test each topic with a set intersection
+    tokens = frozenset(WORD_RE.findall(query.lower()))
     
     # Try to provide relevant information based on keywords
-    if "temperature" in query_lower:
+    if tokens & TEMPERATURE_WORDS:
         return """Based on our database, here's what I can tell you about temperature:
 
 🌡️ **Temperature Data Available:**
@@ -575,7 +725,7 @@ def generate_fallback_response(query: str) -> str:
 
 💡 **Try asking:** "What's the average temperature?" or "Show temperature by region" """
     
-    elif "salinity" in query_lower:
+    elif tokens & SALINITY_WORDS:
         return """Here's information about salinity in our database:
 
 🧂 **Salinity Measurements:**
@@ -585,7 +735,7 @@ def generate_fallback_response(query: str) -> str:
 
 💡 **Try asking:** "What's the salinity range?" or "Show salinity data" """
     
-    elif "bot" in query_lower or "agro" in query_lower:
+    elif tokens & BOT_WORDS:
         return """Information about our Agro-Bot fleet:
 
 🤖 **Current Fleet Status:**
@@ -595,7 +745,7 @@ def generate_fallback_response(query: str) -> str:
 
 💡 **Try asking:** "Show bot status" or "Which bots are active?" """
     
-    elif "pollution" in query_lower:
+    elif tokens & POLLUTION_WORDS:
         return """Pollution monitoring information:
 
 🚨 **Pollution Tracking:**
@@ -620,27 +770,4 @@ def generate_fallback_response(query: str) -> str:
 - "Find pollution hotspots"
 - "List ocean conditions"
 
-🚀 **Or use the Quick Action buttons in the sidebar!**"""
-
-def format_ai_response(answer: str, original_query: str) -> str:
-    """Format the AI response to be more user-friendly"""
-    # Add context about the query
-    formatted_response = f"**Query:** {original_query}\n\n"
-    
-    # Clean up the answer
-    if "Answer:" in answer:
-        answer = answer.split("Answer:")[-1].strip()
-    
-    # Add helpful context if the answer seems too technical
-    if "SELECT" in answer.upper() or "FROM" in answer.upper():
-        formatted_response += "**Database Query Results:**\n\n"
-    
-    formatted_response += answer
-    
-    # Add suggestions for follow-up questions
-    formatted_response += "\n\n---\n*💡 You can ask follow-up questions or try queries like:*\n"
-    formatted_response += "*- \"Show me more details about this data\"*\n"
-    formatted_response += "*- \"Compare with other regions\"*\n"
-    formatted_response += "*- \"What's the trend over time?\"*"
-    
-    return formatted_response
\ No newline at end of file
+🚀 **Or use the Quick Action buttons in the sidebar!**"""
\ No newline at end of file
@@ -1,14 +1,26 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
 from utils.data_models import get_mock_alerts
 
+# Card styling per severity: (icon, background, border)
+SEVERITY_COLORS = {
+    'critical': ('🔴', '#fee2e2', '#dc2626'),
+    'high': ('🟠', '#fef3c7', '#d97706'),
+    'medium': ('🟡', '#ecfdf5', '#059669'),
+    'low': ('🔵', '#eff6ff', '#2563eb')
+}
+DEFAULT_SEVERITY_COLORS = ('●', '#f9fafb', '#6b7280')
+
 def show_page():
     """Display the alerts page"""
     st.title("Alerts & Notifications")
     
-    # Get alerts data
-    alerts = get_mock_alerts()
+    # Get alerts data as one DataFrame for filtering and counting
+    df = pd.DataFrame(get_mock_alerts())
+    
+    # Parse and format every timestamp once; the metrics and cards reuse these
+    df['ts'] = pd.to_datetime(df['timestamp'])
+    df['ts_str'] = df['ts'].dt.strftime('%Y-%m-%d %H:%M:%S')
     
     # Filter controls
     col1, col2, col3 = st.columns(3)
@@ -31,40 +43,42 @@ def show_page():
             ["All", "Unread", "Read"]
         )
     
-    # Apply filters
-    filtered_alerts = alerts.copy()
+    # Apply filters as boolean masks over whole columns; alerts store severity
+    # and type in lowercase, so only the selected option needs lowering
+    mask = pd.Series(True, index=df.index)
     
     if severity_filter != "All":
-        filtered_alerts = [a for a in filtered_alerts if a['severity'].lower() == severity_filter.lower()]
+        mask &= df['severity'].eq(severity_filter.lower())
     
     if type_filter != "All":
-        filtered_alerts = [a for a in filtered_alerts if a['type'].lower() == type_filter.lower()]
+        mask &= df['type'].eq(type_filter.lower())
     
     if status_filter == "Unread":
-        filtered_alerts = [a for a in filtered_alerts if not a['isRead']]
+        mask &= ~df['isRead']
     elif status_filter == "Read":
-        filtered_alerts = [a for a in filtered_alerts if a['isRead']]
+        mask &= df['isRead']
+    
+    # Skip the boolean-index copy when the filters keep every alert
+    filtered_alerts = (df if mask.all() else df[mask]).to_dict('records')
     
     # Summary metrics
     st.divider()
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_alerts = len(alerts)
+        total_alerts = len(df)
         st.metric("Total Alerts", total_alerts)
     
     with col2:
-        unread_alerts = len([a for a in alerts if not a['isRead']])
+        unread_alerts = int((~df['isRead']).sum())
         st.metric("Unread", unread_alerts)
     
     with col3:
-        critical_alerts = len([a for a in alerts if a['severity'] == 'critical'])
-        high_alerts = len([a for a in alerts if a['severity'] == 'high'])
-        st.metric("Critical/High", critical_alerts + high_alerts)
+        st.metric("Critical/High", int(df['severity'].isin(['critical', 'high']).sum()))
     
     with col4:
-        recent_alerts = len([a for a in alerts if 
-                           (datetime.now() - datetime.fromisoformat(a['timestamp'])).total_seconds() < 3600])
+        one_hour_ago = pd.Timestamp.now() - pd.Timedelta(hours=1)
+        recent_alerts = int((df['ts'] > one_hour_ago).sum())
         st.metric("Last Hour", recent_alerts)
     
     st.divider()
@@ -73,62 +87,32 @@ def show_page():
     if not filtered_alerts:
         st.info("No alerts match the current filters.")
     else:
-        for alert in filtered_alerts:
-            # Determine alert styling
-            severity_colors = {
-                'critical': ('🔴', '#fee2e2', '#dc2626'),
-                'high': ('🟠', '#fef3c7', '#d97706'),
-                'medium': ('🟡', '#ecfdf5', '#059669'),
-                'low': ('🔵', '#eff6ff', '#2563eb')
-            }
-            
-            icon, bg_color, border_color = severity_colors.get(alert['severity'], ('●', '#f9fafb', '#6b7280'))
-            
-            # Create alert card
-            with st.container():
-                st.markdown(f"""
-                <div style="
-                    border-left: 4px solid {border_color};
-                    background-color: {bg_color};
-                    padding: 1rem;
-                    margin: 0.5rem 0;
-                    border-radius: 0.375rem;
-                ">
-                    <div style="display: flex; justify-content: between; align-items: start;">
-                        <div style="flex: 1;">
-                            <h4 style="margin: 0; color: {border_color};">
-                                {icon} {alert['title']}
-                            </h4>
-                            <p style="margin: 0.25rem 0; color: #4b5563;">
-                                {alert['description']}
-                            </p>
-                            <div style="display: flex; gap: 1rem; margin-top: 0.5rem; font-size: 0.875rem; color: #6b7280;">
-                                <span>📍 {alert['location']['latitude']:.2f}, {alert['location']['longitude']:.2f}</span>
-                                <span>🕐 {datetime.fromisoformat(alert['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}</span>
-                                <span>📋 {alert['type'].title()}</span>
-                                <span>{'✓ Read' if alert['isRead'] else '○ Unread'}</span>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # Action buttons
-                col_btn1, col_btn2, col_btn3, col_btn4 = st.columns([1, 1, 1, 3])
-                
-                with col_btn1:
-                    if st.button(f"Mark {'Unread' if alert['isRead'] else 'Read'}", key=f"read_{alert['id']}"):
-                        st.success(f"Alert marked as {'unread' if alert['isRead'] else 'read'}!")
-                
-                with col_btn2:
-                    if st.button("View Details", key=f"details_{alert['id']}"):
-                        show_alert_details(alert)
-                
-                with col_btn3:
-                    if st.button("Resolve", key=f"resolve_{alert['id']}"):
-                        st.success("Alert resolved!")
-                
-                st.write("")  # Add spacing
+        # Every card goes to the browser as one markdown element
+        st.markdown("\n".join(alert_card_html(alert) for alert in filtered_alerts), unsafe_allow_html=True)
+        
+        # One set of action buttons for the selected alert instead of one per card
+        alerts_by_id = {alert['id']: alert for alert in filtered_alerts}
+        selected_id = st.selectbox(
+            "Act on alert",
+            list(alerts_by_id),
+            format_func=lambda alert_id: alerts_by_id[alert_id]['title']
+        )
+        alert = alerts_by_id[selected_id]
+        
+        # Action buttons
+        col_btn1, col_btn2, col_btn3, col_btn4 = st.columns([1, 1, 1, 3])
+        
+        with col_btn1:
+            if st.button(f"Mark {'Unread' if alert['isRead'] else 'Read'}", key=f"read_{alert['id']}"):
+                st.success(f"Alert marked as {'unread' if alert['isRead'] else 'read'}!")
+        
+        with col_btn2:
+            if st.button("View Details", key=f"details_{alert['id']}"):
+                show_alert_details(alert)
+        
+        with col_btn3:
+            if st.button("Resolve", key=f"resolve_{alert['id']}"):
+                st.success("Alert resolved!")
     
     # Alert Statistics
     st.divider()
@@ -138,28 +122,52 @@ def show_page():
     
     with col1:
         # Severity distribution
-        severity_counts = {}
-        for alert in alerts:
-            severity = alert['severity']
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+        df_severity = df['severity'].value_counts(sort=False).rename_axis('Severity').to_frame('Count')
         
-        if severity_counts:
-            df_severity = pd.DataFrame(list(severity_counts.items()), columns=['Severity', 'Count'])
-            st.bar_chart(df_severity.set_index('Severity'))
+        if not df_severity.empty:
+            st.bar_chart(df_severity)
             st.caption("Alert Distribution by Severity")
     
     with col2:
         # Type distribution
-        type_counts = {}
-        for alert in alerts:
-            alert_type = alert['type']
-            type_counts[alert_type] = type_counts.get(alert_type, 0) + 1
+        df_types = df['type'].value_counts(sort=False).rename_axis('Type').to_frame('Count')
         
-        if type_counts:
-            df_types = pd.DataFrame(list(type_counts.items()), columns=['Type', 'Count'])
-            st.bar_chart(df_types.set_index('Type'))
+        if not df_types.empty:
+            st.bar_chart(df_types)
             st.caption("Alert Distribution by Type")
 
+def alert_card_html(alert):
+    """Build the HTML card for one alert"""
+    # Determine alert styling
+    icon, bg_color, border_color = SEVERITY_COLORS.get(alert['severity'], DEFAULT_SEVERITY_COLORS)
+    
+    return f"""
+    <div style="
+        border-left: 4px solid {border_color};
+        background-color: {bg_color};
+        padding: 1rem;
+        margin: 0.5rem 0;
+        border-radius: 0.375rem;
+    ">
+        <div style="display: flex; justify-content: between; align-items: start;">
+            <div style="flex: 1;">
+                <h4 style="margin: 0; color: {border_color};">
+                    {icon} {alert['title']}
+                </h4>
+                <p style="margin: 0.25rem 0; color: #4b5563;">
+                    {alert['description']}
+                </p>
+                <div style="display: flex; gap: 1rem; margin-top: 0.5rem; font-size: 0.875rem; color: #6b7280;">
+                    <span>📍 {alert['location']['latitude']:.2f}, {alert['location']['longitude']:.2f}</span>
+                    <span>🕐 {alert['ts_str']}</span>
+                    <span>📋 {alert['type'].title()}</span>
+                    <span>{'✓ Read' if alert['isRead'] else '○ Unread'}</span>
+                </div>
+            </div>
+        </div>
+    </div>
+    """
+
 def show_alert_details(alert):
     """Show detailed alert information in a modal"""
     with st.expander(f"Alert Details: {alert['title']}", expanded=True):
@@ -176,7 +184,7 @@ def show_alert_details(alert):
             st.write("**Location & Timing:**")
             st.write(f"- **Latitude:** {alert['location']['latitude']}")
             st.write(f"- **Longitude:** {alert['location']['longitude']}")
-            st.write(f"- **Timestamp:** {datetime.fromisoformat(alert['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}")
+            st.write(f"- **Timestamp:** {alert['ts_str']}")
         
         st.write("**Description:**")
         st.write(alert['description'])
@@ -13,9 +13,34 @@ def show_real_argo_overview():
     st.title("Indian Ocean ARGO Data Overview")
     st.caption("Real oceanographic data from ARGO floats - January 2024")
     
-    # Get real ARGO data and stats
-    argo_stats = get_argo_summary_stats()
-    argo_data = get_real_argo_data(limit=500)
+    # Drop this session's snapshot and the shared query caches so the load
+    # below goes back to the database
+    if st.button("🔄 Refresh data", type="secondary"):
+        st.session_state.pop('argo_overview_data', None)
+        st.session_state.pop('argo_overview_stats', None)
+        get_real_argo_data.clear()
+        get_argo_summary_stats.clear()
+    
+    # The measurements and stats are loaded together once per session; reruns
+    # reuse the same snapshot rather than copying it back out of the data cache,
+    # so the header counts always describe the plotted rows
+    argo_data = st.session_state.get('argo_overview_data')
+    argo_stats = st.session_state.get('argo_overview_stats')
+    if argo_data is None:
+        argo_stats = get_argo_summary_stats()
+        argo_data = get_real_argo_data(limit=500)
+        
+        # float32 keeps more precision than the 2-3 decimals shown and halves
+        # what plotly and st.dataframe serialize for the browser; Arrow-backed
+        # columns then reach st.dataframe without a pandas-to-Arrow conversion
+        float_cols = argo_data.select_dtypes('float64').columns
+        argo_data[float_cols] = argo_data[float_cols].astype('float32')
+        argo_data = argo_data.convert_dtypes(convert_integer=False, dtype_backend='pyarrow')
+        
+        # Failed loads come back empty; leave those out so the next run retries
+        if not argo_data.empty:
+            st.session_state.argo_overview_data = argo_data
+            st.session_state.argo_overview_stats = argo_stats
     
     # Data source indicator
     if argo_stats['total_measurements'] > 0:
@@ -60,8 +85,11 @@ def show_real_argo_overview():
     # Regional breakdown
     st.subheader(" Regional Data Summary")
     
-    if argo_stats['regional_breakdown']:
-        regional_df = pd.DataFrame(argo_stats['regional_breakdown'])
+    if not argo_stats['regional_breakdown'].empty:
+        # assign, not an in-place column: the stats are shared across reruns
+        regional_df = argo_stats['regional_breakdown'].assign(
+            percentage=lambda df: df['count'] / argo_stats['total_measurements'] * 100
+        )
         
         col1, col2 = st.columns(2)
         
@@ -85,142 +113,88 @@ def show_real_argo_overview():
         
         # Regional data table
         st.subheader("📋 Regional Statistics")
-        for region_data in argo_stats['regional_breakdown']:
+        for region_data in regional_df.itertuples(index=False):
             col1, col2, col3, col4 = st.columns(4)
             with col1:
-                st.metric(f"📍 {region_data['region']}", f"{region_data['count']:,} measurements")
+                st.metric(f"📍 {region_data.region}", f"{region_data.count:,} measurements")
             with col2:
-                st.metric("🌡️ Avg Temp", f"{region_data['avg_temperature']:.1f}°C")
+                st.metric("🌡️ Avg Temp", f"{region_data.avg_temperature:.1f}°C")
             with col3:
-                st.metric("🧂 Avg Salinity", f"{region_data['avg_salinity']:.1f} PSU")
+                st.metric("🧂 Avg Salinity", f"{region_data.avg_salinity:.1f} PSU")
             with col4:
-                percentage = (region_data['count'] / argo_stats['total_measurements']) * 100
-                st.metric("📊 Coverage", f"{percentage:.1f}%")
+                st.metric("📊 Coverage", f"{region_data.percentage:.1f}%")
+    
+    # Everything below plots the measurements themselves
+    if argo_data.empty:
+        st.info("No ARGO measurements available to plot.")
+        return
     
     # Time series charts
-    if not argo_data.empty:
-        st.subheader("📈 Oceanographic Measurements Over Time")
-        
-        # Convert date_time to datetime
-        argo_data['date_time'] = pd.to_datetime(argo_data['date_time'])
-        
-        # Sample data for visualization (to avoid overcrowding)
-        if len(argo_data) > 1000:
-            sample_data = argo_data.sample(n=1000).sort_values('date_time')
-        else:
-            sample_data = argo_data.sort_values('date_time')
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Temperature over time
-            fig_temp_time = px.scatter(sample_data, x='date_time', y='temperature',
-                                      color='region',
-                                      title='Temperature Measurements',
-                                      labels={'temperature': 'Temperature (°C)', 'date_time': 'Date & Time'},
-                                      hover_data=['float_id', 'depth'])
-            st.plotly_chart(fig_temp_time, use_container_width=True)
-        
-        with col2:
-            # Salinity over time
-            fig_sal_time = px.scatter(sample_data, x='date_time', y='salinity',
-                                     color='region',
-                                     title='Salinity Measurements',
-                                     labels={'salinity': 'Salinity (PSU)', 'date_time': 'Date & Time'},
-                                     hover_data=['float_id', 'depth'])
-            st.plotly_chart(fig_sal_time, use_container_width=True)
-        
-        # Temperature vs Depth profile
-        st.subheader("🌊 Ocean Depth Profiles")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            # Temperature vs depth
-            fig_temp_depth = px.scatter(sample_data, x='temperature', y='depth',
-                                       color='region',
-                                       title='Temperature vs Depth Profile',
-                                       labels={'temperature': 'Temperature (°C)', 'depth': 'Depth (m)'},
-                                       hover_data=['float_id'])
-            fig_temp_depth.update_yaxis(autorange="reversed")  # Depth increases downward
-            st.plotly_chart(fig_temp_depth, use_container_width=True)
-        
-        with col2:
-            # Salinity vs depth
-            fig_sal_depth = px.scatter(sample_data, x='salinity', y='depth',
-                                      color='region',
-                                      title='Salinity vs Depth Profile',
-                                      labels={'salinity': 'Salinity (PSU)', 'depth': 'Depth (m)'},
-                                      hover_data=['float_id'])
-            fig_sal_depth.update_yaxis(autorange="reversed")  # Depth increases downward
-            st.plotly_chart(fig_sal_depth, use_container_width=True)
+    st.subheader("📈 Oceanographic Measurements Over Time")
+    
+    # Sample data for visualization (to avoid overcrowding), then convert
+    # date_time on the kept rows only
+    sample_data = argo_data.sample(n=1000, random_state=0) if len(argo_data) > 1000 else argo_data
+    sample_data = sample_data.assign(date_time=pd.to_datetime(sample_data['date_time'])).sort_values('date_time')
+    
+    # Figures are rebuilt only when the sample changes
+    fig_temp_time, fig_sal_time, fig_temp_depth, fig_sal_depth = build_measurement_figures(sample_data)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Temperature over time
+        st.plotly_chart(fig_temp_time, use_container_width=True)
+    
+    with col2:
+        # Salinity over time
+        st.plotly_chart(fig_sal_time, use_container_width=True)
+    
+    # Temperature vs Depth profile
+    st.subheader("🌊 Ocean Depth Profiles")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Temperature vs depth
+        st.plotly_chart(fig_temp_depth, use_container_width=True)
+    
+    with col2:
+        # Salinity vs depth
+        st.plotly_chart(fig_sal_depth, use_container_width=True)
     
     # Interactive map of ARGO float locations
     st.subheader("🗺️ ARGO Float Locations")
     st.caption("January 2024 measurement locations in the Indian Ocean")
     
-    if not argo_data.empty:
-        # Sample unique locations to avoid map overcrowding
-        unique_locations = argo_data.groupby(['float_id', 'latitude', 'longitude']).agg({
-            'temperature': 'mean',
-            'salinity': 'mean',
-            'date_time': 'count',
-            'region': 'first'
-        }).reset_index()
-        unique_locations.columns = ['float_id', 'latitude', 'longitude', 'avg_temp', 'avg_sal', 'measurements', 'region']
-        
-        # Create map centered on Indian Ocean
-        m = folium.Map(
-            location=[15.0, 75.0],  # Central Indian Ocean
-            zoom_start=4,
-            tiles="OpenStreetMap"
-        )
-        
-        # Color mapping for regions
-        region_colors = {
-            'Arabian Sea': 'red',
-            'Bay of Bengal': 'blue', 
-            'Indian Ocean': 'green'
-        }
-        
-        # Add markers for each float location
-        for _, location in unique_locations.iterrows():
-            color = region_colors.get(location['region'], 'gray')
-            
-            folium.CircleMarker(
-                location=[location['latitude'], location['longitude']],
-                radius=8,
-                popup=f"""
-                <b>Float ID:</b> {location['float_id']}<br>
-                <b>Region:</b> {location['region']}<br>
-                <b>Measurements:</b> {location['measurements']}<br>
-                <b>Avg Temperature:</b> {location['avg_temp']:.2f}°C<br>
-                <b>Avg Salinity:</b> {location['avg_sal']:.2f} PSU<br>
-                <b>Location:</b> {location['latitude']:.2f}°N, {location['longitude']:.2f}°E
-                """,
-                color=color,
-                fillColor=color,
-                fillOpacity=0.7
-            ).add_to(m)
-        
-        # Display map
-        map_data = st_folium(m, width=700, height=500)
+    # Sample unique locations to avoid map overcrowding; a categorical
+    # float_id lets the groupby use integer codes instead of hashing strings
+    unique_locations = argo_data.astype({'float_id': 'category'}).groupby(
+        ['float_id', 'latitude', 'longitude'], observed=True
+    ).agg({
+        'temperature': 'mean',
+        'salinity': 'mean',
+        'date_time': 'count',
+        'region': 'first'
+    }).reset_index()
+    unique_locations.columns = ['float_id', 'latitude', 'longitude', 'avg_temp', 'avg_sal', 'measurements', 'region']
+    
+    # The map is rebuilt only when the float locations change
+    m = build_float_map(unique_locations)
+    
+    # Display map
+    map_data = st_folium(m, width=700, height=500)
     
     # Data table with recent measurements
     st.subheader("📋 Recent ARGO Measurements")
     
-    if not argo_data.empty:
-        # Show recent measurements
-        display_data = argo_data.head(20).copy()
-        display_data['temperature'] = display_data['temperature'].round(2)
-        display_data['salinity'] = display_data['salinity'].round(2)
-        display_data['latitude'] = display_data['latitude'].round(3)
-        display_data['longitude'] = display_data['longitude'].round(3)
-        display_data['depth'] = display_data['depth'].round(1)
-        
-        # Rename columns for better display
-        display_data = display_data[['float_id', 'region', 'date_time', 'latitude', 'longitude', 
-                                   'temperature', 'salinity', 'depth']].rename(columns={
+    # Show recent measurements: select, parse, round and rename in one chain
+    display_data = (
+        argo_data.head(20)[['float_id', 'region', 'date_time', 'latitude', 'longitude',
+                            'temperature', 'salinity', 'depth']]
+        .assign(date_time=lambda d: pd.to_datetime(d['date_time']))
+        .round({'temperature': 2, 'salinity': 2, 'latitude': 3, 'longitude': 3, 'depth': 1})
+        .rename(columns={
             'float_id': 'Float ID',
             'region': 'Region',
             'date_time': 'Date & Time',
@@ -230,8 +204,88 @@ def show_real_argo_overview():
             'salinity': 'Salinity (PSU)',
             'depth': 'Depth (m)'
         })
-        
-        st.dataframe(display_data, use_container_width=True)
+    )
+    
+    st.dataframe(display_data, use_container_width=True)
+
+@st.cache_data(max_entries=4)
+def build_measurement_figures(sample_data: pd.DataFrame) -> tuple:
+    """Build the time-series and depth-profile scatter plots for a sample"""
+    # Temperature over time
+    fig_temp_time = px.scatter(sample_data, x='date_time', y='temperature',
+                              color='region',
+                              title='Temperature Measurements',
+                              labels={'temperature': 'Temperature (°C)', 'date_time': 'Date & Time'},
+                              hover_data=['float_id', 'depth'])
+    
+    # Salinity over time
+    fig_sal_time = px.scatter(sample_data, x='date_time', y='salinity',
+                             color='region',
+                             title='Salinity Measurements',
+                             labels={'salinity': 'Salinity (PSU)', 'date_time': 'Date & Time'},
+                             hover_data=['float_id', 'depth'])
+    
+    # Temperature vs depth
+    fig_temp_depth = px.scatter(sample_data, x='temperature', y='depth',
+                               color='region',
+                               title='Temperature vs Depth Profile',
+                               labels={'temperature': 'Temperature (°C)', 'depth': 'Depth (m)'},
+                               hover_data=['float_id'])
+    fig_temp_depth.update_yaxes(autorange="reversed")  # Depth increases downward
+    
+    # Salinity vs depth
+    fig_sal_depth = px.scatter(sample_data, x='salinity', y='depth',
+                              color='region',
+                              title='Salinity vs Depth Profile',
+                              labels={'salinity': 'Salinity (PSU)', 'depth': 'Depth (m)'},
+                              hover_data=['float_id'])
+    fig_sal_depth.update_yaxes(autorange="reversed")  # Depth increases downward
+    
+    return fig_temp_time, fig_sal_time, fig_temp_depth, fig_sal_depth
+
+@st.cache_resource(max_entries=4)
+def build_float_map(unique_locations: pd.DataFrame) -> folium.Map:
+    """Build the ARGO float location map once per distinct set of locations"""
+    # Create map centered on Indian Ocean
+    m = folium.Map(
+        location=[15.0, 75.0],  # Central Indian Ocean
+        zoom_start=4,
+        tiles="OpenStreetMap"
+    )
+    
+    # Color mapping for regions
+    region_colors = {
+        'Arabian Sea': 'red',
+        'Bay of Bengal': 'blue', 
+        'Indian Ocean': 'green'
+    }
+    
+    # Marker colours and popup HTML for every float, built column-wise
+    colors = unique_locations['region'].map(region_colors).fillna('gray')
+    popups = (
+        "<b>Float ID:</b> " + unique_locations['float_id'].astype(str) + "<br>"
+        + "<b>Region:</b> " + unique_locations['region'].astype(str) + "<br>"
+        + "<b>Measurements:</b> " + unique_locations['measurements'].astype(str) + "<br>"
+        + "<b>Avg Temperature:</b> " + unique_locations['avg_temp'].map('{:.2f}'.format) + "°C<br>"
+        + "<b>Avg Salinity:</b> " + unique_locations['avg_sal'].map('{:.2f}'.format) + " PSU<br>"
+        + "<b>Location:</b> " + unique_locations['latitude'].map('{:.2f}'.format) + "°N, "
+        + unique_locations['longitude'].map('{:.2f}'.format) + "°E"
+    )
+    
+    # Add markers for each float location into one layer
+    markers = folium.FeatureGroup(name="ARGO floats")
+    for latitude, longitude, color, popup in zip(unique_locations['latitude'], unique_locations['longitude'], colors, popups):
+        folium.CircleMarker(
+            location=[latitude, longitude],
+            radius=8,
+            popup=popup,
+            color=color,
+            fillColor=color,
+            fillOpacity=0.7
+        ).add_to(markers)
+    markers.add_to(m)
+    
+    return m
 
 if __name__ == "__main__":
 
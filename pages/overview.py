@@ -2,11 +2,243 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
 from utils.data_models import get_real_argo_data, get_argo_summary_stats
-import folium
-from streamlit_folium import st_folium
-import numpy as np
+
+@st.cache_resource(ttl=300, max_entries=1)
+def _cached_argo(limit: int) -> pd.DataFrame:
+    """The page's measurements, shared by reference across reruns; treat as read-only"""
+    argo_data = get_real_argo_data(limit=limit)
+    if not argo_data.empty:
+        # Parse once per load, with the format the ingestion writes, instead of
+        # inferring it on every rerun
+        argo_data['date_time'] = pd.to_datetime(argo_data['date_time'], format='%Y-%m-%d %H:%M:%S')
+        
+        # A handful of repeated labels: integer codes make the groupby, colour
+        # mapping and float lookups cheaper than comparing strings
+        argo_data['region'] = argo_data['region'].astype('category')
+        argo_data['float_id'] = argo_data['float_id'].astype('category')
+    return argo_data
+
+@st.cache_resource(ttl=300, max_entries=1)
+def _latest_by_float(limit: int) -> pd.DataFrame:
+    """Most recent measurement per float, indexed by float_id for direct lookups"""
+    # Rows arrive newest first, so the first row kept per float is its latest
+    latest = _cached_argo(limit).drop_duplicates('float_id').set_index('float_id')
+    # Whether each float's latest reading has a pH value, decided once per load
+    latest['has_ph'] = latest['ph'].notna() if 'ph' in latest.columns else False
+    return latest
+
+@st.cache_resource(ttl=300, max_entries=1)
+def _time_series_slice(limit: int) -> pd.DataFrame:
+    """The 50 most recent measurements in chronological order, sorted once per load"""
+    # Rows arrive newest first, so the head is already nearly reverse-sorted;
+    # the stable mergesort keeps ties in arrival order
+    time_series = _cached_argo(limit).head(50).sort_values('date_time', kind='mergesort')
+    time_series.attrs['has_ph'] = 'ph' in time_series.columns and bool(time_series['ph'].notna().any())
+    return time_series
+
+@st.cache_data(max_entries=4)
+def _float_location_summary(argo_data: pd.DataFrame) -> pd.DataFrame:
+    """One row per float position with its average readings and measurement count"""
+    return argo_data.groupby(['float_id', 'latitude', 'longitude'], sort=False, observed=True).agg(
+        avg_temp=('temperature', 'mean'),
+        avg_sal=('salinity', 'mean'),
+        measurements=('date_time', 'count'),
+        region=('region', 'first')
+    ).reset_index()
+
+@st.cache_resource(max_entries=4)
+def _build_argo_map(unique_locations: pd.DataFrame) -> "folium.Map":
+    """Folium map with one marker per float position"""
+    # folium is only needed when there are floats to draw
+    import folium
+    
+    # Create map centered on Indian Ocean; prefer_canvas draws the circle
+    # markers on one canvas layer instead of one SVG element each
+    m = folium.Map(
+        location=[15.0, 75.0],  # Central Indian Ocean
+        zoom_start=4,
+        tiles="OpenStreetMap",
+        prefer_canvas=True
+    )
+    
+    # Color mapping for regions
+    region_colors = {
+        'Arabian Sea': 'red',
+        'Bay of Bengal': 'blue', 
+        'Indian Ocean': 'green'
+    }
+    
+    # Add markers for each ARGO float location
+    for float_id, lat, lon, avg_temp, avg_sal, measurements, region in unique_locations.itertuples(index=False, name=None):
+        color = region_colors.get(region, 'gray')
+        
+        folium.CircleMarker(
+            location=[lat, lon],
+            radius=8,
+            popup=f"""
+            <b>ARGO Float:</b> {float_id}<br>
+            <b>Region:</b> {region}<br>
+            <b>Measurements:</b> {measurements}<br>
+            <b>Avg Temperature:</b> {avg_temp:.2f}°C<br>
+            <b>Avg Salinity:</b> {avg_sal:.2f} PSU<br>
+            <b>Location:</b> {lat:.2f}°N, {lon:.2f}°E
+            """,
+            color=color,
+            fillColor=color,
+            fillOpacity=0.7,
+            tooltip=f"ARGO Float {float_id}"
+        ).add_to(m)
+    
+    return m
+
+def _metric_tiles_html(tiles: list, columns: int) -> str:
+    """One HTML grid of metric tiles; each tile is (label, value, caption or None)"""
+    # Text inherits the theme's colour so the tiles read in light and dark mode;
+    # captions are dimmed rather than green, since they are not deltas
+    # Built without blank lines or indentation: markdown ends an HTML block at
+    # the first blank line and would show what follows as a code block
+    cells = []
+    for label, value, caption in tiles:
+        caption_html = (
+            f'<div style="font-size: 0.875rem; color: inherit; opacity: 0.6;">{caption}</div>' if caption else ''
+        )
+        cells.append(
+            '<div>'
+            f'<div style="font-size: 0.875rem; color: inherit;">{label}</div>'
+            f'<div style="font-size: 1.75rem; color: inherit;">{value}</div>'
+            f'{caption_html}'
+            '</div>'
+        )
+    
+    return (
+        f'<div style="display: grid; grid-template-columns: repeat({columns}, 1fr); gap: 1rem; margin-bottom: 1rem;">'
+        f'{"".join(cells)}'
+        '</div>'
+    )
+
+@st.fragment
+def _float_detail(latest_by_float: pd.DataFrame):
+    """Float selector and the latest reading for the chosen float"""
+    # Get unique floats for selection
+    selected_float = st.selectbox("Select an ARGO Float:", latest_by_float.index)
+    
+    if selected_float:
+        float_data = latest_by_float.loc[selected_float]
+        
+        st.write(f"**ARGO Float {selected_float}**")
+        st.write(f"Region: 🌊 {float_data['region']}")
+        
+        # Float metrics, two per row, sent as a single element
+        ph_value = f"{float_data['ph']:.2f}" if float_data['has_ph'] else "N/A"
+        st.markdown(_metric_tiles_html([
+            ("🌡️ Temperature", f"{float_data['temperature']:.2f}°C", None),
+            ("🌊 Depth", f"{float_data['depth']:.1f} m", None),
+            ("💧 Salinity", f"{float_data['salinity']:.2f} PSU", None),
+            ("📍 Latitude", f"{float_data['latitude']:.3f}°", None),
+            ("pH Level", ph_value, None),
+            ("📍 Longitude", f"{float_data['longitude']:.3f}°", None),
+        ], columns=2), unsafe_allow_html=True)
+        
+        # Last measurement time
+        st.caption(f"Last measurement: {float_data['date_time'].strftime('%Y-%m-%d %H:%M:%S')}")
+
+# Region colours shared by the depth profiles
+REGION_MARKER_COLORS = {
+    'Arabian Sea': 'red',
+    'Bay of Bengal': 'blue', 
+    'Indian Ocean': 'green'
+}
+
+def _region_figure(data: pd.DataFrame, x: str, y: str, mode: str, title: str,
+                   x_title: str, y_title: str, colors: dict = None) -> go.Figure:
+    """One WebGL trace per region, as px colours by region, without its tidy-data reshaping"""
+    fig = go.Figure()
+    for region, group in data.groupby('region', observed=True, sort=False):
+        color = colors.get(region) if colors else None
+        fig.add_trace(go.Scattergl(
+            x=group[x].to_numpy(), y=group[y].to_numpy(), mode=mode, name=str(region),
+            marker=dict(color=color), line=dict(color=color)
+        ))
+    # uirevision keeps the user's zoom and pan when the figure is redrawn
+    fig.update_layout(title=title, xaxis_title=x_title, yaxis_title=y_title,
+                      legend_title_text='region', uirevision='const')
+    return fig
+
+@st.cache_data(max_entries=4)
+def _time_series_figures(time_series_data: pd.DataFrame, has_ph: bool) -> tuple:
+    """Temperature, salinity and pH line charts; the pH chart is None without pH readings"""
+    fig_temp = _region_figure(time_series_data, 'date_time', 'temperature', 'lines',
+                              'Temperature Measurements', 'Date & Time', 'Temperature (°C)')
+    fig_temp.update_layout(height=250)
+    
+    fig_sal = _region_figure(time_series_data, 'date_time', 'salinity', 'lines',
+                             'Salinity (PSU)', 'Date & Time', 'Salinity (PSU)')
+    fig_sal.update_layout(height=200)
+    
+    fig_ph = None
+    if has_ph:
+        fig_ph = _region_figure(time_series_data, 'date_time', 'ph', 'lines',
+                                'pH Level', 'Date & Time', 'pH Level')
+        fig_ph.update_layout(height=200)
+    
+    return fig_temp, fig_sal, fig_ph
+
+@st.cache_data(max_entries=4)
+def _statistics_figures(regional_df: pd.DataFrame, hist_sample: pd.DataFrame) -> tuple:
+    """Regional pie, temperature histogram and per-region temperature bar"""
+    # Regional distribution
+    fig_regional = px.pie(
+        regional_df,
+        values='count',
+        names='region',
+        title="Regional Data Distribution",
+        color_discrete_map={
+            'Arabian Sea': '#ff7f0e',
+            'Bay of Bengal': '#1f77b4', 
+            'Indian Ocean': '#2ca02c'
+        }
+    )
+    
+    # Temperature distribution
+    fig_temp_dist = go.Figure(go.Histogram(
+        x=hist_sample['temperature'].to_numpy(),
+        nbinsx=20,
+        marker_color='#ff7f0e'
+    ))
+    fig_temp_dist.update_layout(title="Temperature Distribution",
+                                xaxis_title='Temperature (°C)', yaxis_title='Count')
+    
+    # Regional temperature comparison, from the same frame as the pie
+    fig_regional_temp = px.bar(
+        regional_df,
+        x='region',
+        y='avg_temperature',
+        title="Avg Temperature by Region",
+        labels={'region': 'Region', 'avg_temperature': 'Temperature (°C)'},
+        color='avg_temperature',
+        color_continuous_scale='RdYlBu_r'
+    )
+    fig_regional_temp.update_xaxes(tickangle=45)
+    
+    return fig_regional, fig_temp_dist, fig_regional_temp
+
+@st.cache_data(max_entries=4)
+def _depth_figures(depth_sample: pd.DataFrame) -> tuple:
+    """Temperature and salinity against depth, depth increasing downward"""
+    # Temperature vs depth
+    fig_depth_temp = _region_figure(depth_sample, 'temperature', 'depth', 'markers',
+                                    'Temperature vs Depth Profile', 'Temperature (°C)', 'Depth (m)',
+                                    colors=REGION_MARKER_COLORS)
+    fig_depth_temp.update_layout(yaxis=dict(autorange="reversed"))  # Depth increases downward
+    
+    # Salinity vs depth
+    fig_depth_sal = _region_figure(depth_sample, 'salinity', 'depth', 'markers',
+                                   'Salinity vs Depth Profile', 'Salinity (PSU)', 'Depth (m)',
+                                   colors=REGION_MARKER_COLORS)
+    fig_depth_sal.update_layout(yaxis=dict(autorange="reversed"))  # Depth increases downward
+    
+    return fig_depth_temp, fig_depth_sal
 
 def show_page():
     """Display the overview page"""
@@ -15,7 +247,7 @@ def show_page():
     
     # Get real ARGO data
     argo_stats = get_argo_summary_stats()
-    argo_data = get_real_argo_data(limit=200)
+    argo_data = _cached_argo(200)
     
     # Check if we have data
     if argo_stats['total_measurements'] == 0:
@@ -28,36 +260,15 @@ def show_page():
         date_range = f"{argo_stats['earliest_date']} to {argo_stats['latest_date']}"
         st.info(f"📅 **Data Period**: {date_range}")
     
-    # KPI Metrics using real ARGO data
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric(
-            label="🚢 Active ARGO Floats",
-            value=str(argo_stats['unique_floats']),
-            delta=f"{argo_stats['total_measurements']:,} measurements"
-        )
-    
-    with col2:
-        st.metric(
-            label="🌡️ Avg Ocean Temperature",
-            value=f"{argo_stats['avg_temperature']:.1f}°C",
-            delta="Real-time"
-        )
-    
-    with col3:
-        st.metric(
-            label="🧂 Avg Salinity",
-            value=f"{argo_stats['avg_salinity']:.1f} PSU",
-            delta="Real-time"
-        )
-    
-    with col4:
-        st.metric(
-            label="🌐 Ocean Regions",
-            value=str(len(argo_stats['regional_breakdown'])),
-            delta="Covered areas"
-        )
+    # KPI Metrics using real ARGO data; the captions are labels, not changes,
+    # so the four tiles go out as one static element
+    st.markdown(_metric_tiles_html([
+        ("🚢 Active ARGO Floats", str(argo_stats['unique_floats']),
+         f"{argo_stats['total_measurements']:,} measurements"),
+        ("🌡️ Avg Ocean Temperature", f"{argo_stats['avg_temperature']:.1f}°C", "Real-time"),
+        ("🧂 Avg Salinity", f"{argo_stats['avg_salinity']:.1f} PSU", "Real-time"),
+        ("🌐 Ocean Regions", str(len(argo_stats['regional_breakdown'])), "Covered areas"),
+    ], columns=4), unsafe_allow_html=True)
     
     # Main content in two columns
     col_left, col_right = st.columns([1, 1])
@@ -68,54 +279,36 @@ def show_page():
         st.caption("Recent measurements from ARGO floats")
         
         if not argo_data.empty:
-            # Convert date_time to datetime
-            argo_data['date_time'] = pd.to_datetime(argo_data['date_time'])
-            
             # Sample data for time series (take most recent 50 points)
-            time_series_data = argo_data.head(50).sort_values('date_time')
+            time_series_data = _time_series_slice(200)
+            
+            fig_temp, fig_sal, fig_ph = _time_series_figures(
+                time_series_data, time_series_data.attrs.get('has_ph', False)
+            )
             
             # Temperature chart
-            fig_temp = px.line(time_series_data, x='date_time', y='temperature', 
-                              color='region',
-                              title='Temperature Measurements',
-                              labels={'temperature': 'Temperature (°C)', 'date_time': 'Date & Time'})
-            fig_temp.update_layout(height=250)
             st.plotly_chart(fig_temp, use_container_width=True)
             
             # Salinity and pH charts
             col_a, col_b = st.columns(2)
             with col_a:
-                fig_sal = px.line(time_series_data, x='date_time', y='salinity',
-                                 color='region',
-                                 title='Salinity (PSU)',
-                                 labels={'salinity': 'Salinity (PSU)', 'date_time': 'Date & Time'})
-                fig_sal.update_layout(height=200)
                 st.plotly_chart(fig_sal, use_container_width=True)
             
             with col_b:
-                if 'ph' in time_series_data.columns and time_series_data['ph'].notna().any():
-                    fig_ph = px.line(time_series_data, x='date_time', y='ph',
-                                    color='region',
-                                    title='pH Level',
-                                    labels={'ph': 'pH Level', 'date_time': 'Date & Time'})
-                    fig_ph.update_layout(height=200)
+                if fig_ph is not None:
                     st.plotly_chart(fig_ph, use_container_width=True)
                 else:
                     st.info("pH data not available for selected measurements")
             
             # Recent measurements table
             st.subheader("📋 Recent ARGO Measurements")
-            display_data = argo_data.head(10).copy()
-            display_data['temperature'] = display_data['temperature'].round(2)
-            display_data['salinity'] = display_data['salinity'].round(2)
-            display_data['latitude'] = display_data['latitude'].round(3)
-            display_data['longitude'] = display_data['longitude'].round(3)
-            display_data['depth'] = display_data['depth'].round(1)
             
-            # Select and rename columns for display
+            # Select the display columns first, then round them in one call and rename
             display_columns = ['float_id', 'region', 'date_time', 'latitude', 'longitude', 
                              'temperature', 'salinity', 'depth']
-            display_data = display_data[display_columns].rename(columns={
+            display_data = argo_data.head(10).loc[:, display_columns].round(
+                {'temperature': 2, 'salinity': 2, 'latitude': 3, 'longitude': 3, 'depth': 1}
+            ).rename(columns={
                 'float_id': 'Float ID',
                 'region': 'Region',
                 'date_time': 'Date & Time',
@@ -135,52 +328,15 @@ def show_page():
         st.caption("Real ARGO float positions in the Indian Ocean")
         
         if not argo_data.empty:
-            # Get unique float locations to avoid map overcrowding
-            unique_locations = argo_data.groupby(['float_id', 'latitude', 'longitude']).agg({
-                'temperature': 'mean',
-                'salinity': 'mean',
-                'date_time': 'count',
-                'region': 'first'
-            }).reset_index()
-            unique_locations.columns = ['float_id', 'latitude', 'longitude', 'avg_temp', 'avg_sal', 'measurements', 'region']
+            from streamlit_folium import st_folium
             
-            # Create map centered on Indian Ocean
-            m = folium.Map(
-                location=[15.0, 75.0],  # Central Indian Ocean
-                zoom_start=4,
-                tiles="OpenStreetMap"
-            )
-            
-            # Color mapping for regions
-            region_colors = {
-                'Arabian Sea': 'red',
-                'Bay of Bengal': 'blue', 
-                'Indian Ocean': 'green'
-            }
-            
-            # Add markers for each ARGO float location
-            for _, location in unique_locations.iterrows():
-                color = region_colors.get(location['region'], 'gray')
-                
-                folium.CircleMarker(
-                    location=[location['latitude'], location['longitude']],
-                    radius=8,
-                    popup=f"""
-                    <b>ARGO Float:</b> {location['float_id']}<br>
-                    <b>Region:</b> {location['region']}<br>
-                    <b>Measurements:</b> {location['measurements']}<br>
-                    <b>Avg Temperature:</b> {location['avg_temp']:.2f}°C<br>
-                    <b>Avg Salinity:</b> {location['avg_sal']:.2f} PSU<br>
-                    <b>Location:</b> {location['latitude']:.2f}°N, {location['longitude']:.2f}°E
-                    """,
-                    color=color,
-                    fillColor=color,
-                    fillOpacity=0.7,
-                    tooltip=f"ARGO Float {location['float_id']}"
-                ).add_to(m)
+            # Get unique float locations to avoid map overcrowding
+            unique_locations = _float_location_summary(argo_data)
             
-            # Display map
-            map_data = st_folium(m, width=700, height=400)
+            # The map is rebuilt only when the float locations change; with no
+            # returned objects, panning or zooming it does not rerun the page
+            m = _build_argo_map(unique_locations)
+            st_folium(m, width=700, height=400, key='argo_map', returned_objects=[])
         else:
             st.warning("No ARGO data available for map")
         
@@ -188,35 +344,8 @@ def show_page():
         st.subheader("🚢 ARGO Float Information")
         
         if not argo_data.empty:
-            # Get unique floats for selection
-            unique_floats = argo_data['float_id'].unique()
-            selected_float = st.selectbox("Select an ARGO Float:", unique_floats)
-            
-            if selected_float:
-                float_data = argo_data[argo_data['float_id'] == selected_float].iloc[0]
-                
-                st.write(f"**ARGO Float {selected_float}**")
-                st.write(f"Region: 🌊 {float_data['region']}")
-                
-                # Float metrics
-                col_1, col_2 = st.columns(2)
-                
-                with col_1:
-                    st.metric("🌡️ Temperature", f"{float_data['temperature']:.2f}°C")
-                    st.metric("💧 Salinity", f"{float_data['salinity']:.2f} PSU")
-                    if pd.notna(float_data.get('ph')):
-                        st.metric("pH Level", f"{float_data['ph']:.2f}")
-                    else:
-                        st.metric("pH Level", "N/A")
-                
-                with col_2:
-                    st.metric("🌊 Depth", f"{float_data['depth']:.1f} m")
-                    st.metric("📍 Latitude", f"{float_data['latitude']:.3f}°")
-                    st.metric("📍 Longitude", f"{float_data['longitude']:.3f}°")
-                
-                # Last measurement time
-                measurement_time = pd.to_datetime(float_data['date_time'])
-                st.caption(f"Last measurement: {measurement_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            # The selector and its panel rerun on their own, without the charts and map
+            _float_detail(_latest_by_float(200))
         else:
             st.info("No ARGO float data available.")
     
@@ -224,100 +353,40 @@ def show_page():
     st.divider()
     st.subheader("📈 ARGO Data Statistics")
     
-    if not argo_data.empty and argo_stats['regional_breakdown']:
+    if not argo_data.empty and not argo_stats['regional_breakdown'].empty:
+        # Samples for performance, sized in one place for every figure below
+        hist_sample = argo_data.head(1000)
+        depth_sample = argo_data.head(500)
+        
+        fig_regional, fig_temp_dist, fig_regional_temp = _statistics_figures(
+            argo_stats['regional_breakdown'], hist_sample
+        )
         col1, col2, col3 = st.columns(3)
         
         with col1:
             # Regional distribution
-            regional_df = pd.DataFrame(argo_stats['regional_breakdown'])
-            
-            fig_regional = px.pie(
-                regional_df,
-                values='count',
-                names='region',
-                title="Regional Data Distribution",
-                color_discrete_map={
-                    'Arabian Sea': '#ff7f0e',
-                    'Bay of Bengal': '#1f77b4', 
-                    'Indian Ocean': '#2ca02c'
-                }
-            )
             st.plotly_chart(fig_regional, use_container_width=True)
         
         with col2:
             # Temperature distribution
-            fig_temp_dist = px.histogram(
-                argo_data.head(1000),  # Sample for performance
-                x='temperature',
-                title="Temperature Distribution",
-                labels={'temperature': 'Temperature (°C)', 'count': 'Count'},
-                nbins=20,
-                color_discrete_sequence=['#ff7f0e']
-            )
             st.plotly_chart(fig_temp_dist, use_container_width=True)
         
         with col3:
             # Regional temperature comparison
-            regional_temp_data = []
-            for region_data in argo_stats['regional_breakdown']:
-                regional_temp_data.append({
-                    'Region': region_data['region'],
-                    'Avg Temperature': region_data['avg_temperature'],
-                    'Measurements': region_data['count']
-                })
-            
-            df_regional_temp = pd.DataFrame(regional_temp_data)
-            fig_regional_temp = px.bar(
-                df_regional_temp,
-                x='Region',
-                y='Avg Temperature',
-                title="Avg Temperature by Region",
-                labels={'Avg Temperature': 'Temperature (°C)'},
-                color='Avg Temperature',
-                color_continuous_scale='RdYlBu_r'
-            )
-            fig_regional_temp.update_xaxes(tickangle=45)
             st.plotly_chart(fig_regional_temp, use_container_width=True)
         
         # Additional depth vs temperature analysis
         st.subheader("🌊 Depth Analysis")
+        
+        fig_depth_temp, fig_depth_sal = _depth_figures(depth_sample)
         col1, col2 = st.columns(2)
         
         with col1:
-            # Sample data for depth analysis
-            depth_sample = argo_data.head(500)
-            fig_depth_temp = px.scatter(
-                depth_sample,
-                x='temperature',
-                y='depth',
-                color='region',
-                title='Temperature vs Depth Profile',
-                labels={'temperature': 'Temperature (°C)', 'depth': 'Depth (m)'},
-                color_discrete_map={
-                    'Arabian Sea': 'red',
-                    'Bay of Bengal': 'blue', 
-                    'Indian Ocean': 'green'
-                }
-            )
-            fig_depth_temp.update_layout(yaxis=dict(autorange="reversed"))  # Depth increases downward
+            # Temperature vs depth
             st.plotly_chart(fig_depth_temp, use_container_width=True)
         
         with col2:
             # Salinity vs depth
-            fig_depth_sal = px.scatter(
-                depth_sample,
-                x='salinity',
-                y='depth',
-                color='region',
-                title='Salinity vs Depth Profile',
-                labels={'salinity': 'Salinity (PSU)', 'depth': 'Depth (m)'},
-                color_discrete_map={
-                    'Arabian Sea': 'red',
-                    'Bay of Bengal': 'blue', 
-                    'Indian Ocean': 'green'
-                }
-            )
-            fig_depth_sal.update_layout(yaxis=dict(autorange="reversed"))  # Depth increases downward
             st.plotly_chart(fig_depth_sal, use_container_width=True)
     else:
         st.info("Insufficient data for statistical analysis")
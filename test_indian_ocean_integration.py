@@ -6,6 +6,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from requests_cache import DO_NOT_CACHE
+from requests_cache.policy.expiration import get_url_expiration
+
 from utils.indian_ocean_netcdf import IndianOceanArgoProcessor, IndianOceanArgoConfig
 from utils.database import ArgoDatabase
 
@@ -33,6 +36,18 @@ def test_indian_ocean_integration():
         print(f"   ❌ Processor error: {e}")
         return False
     
+    # Listings go through the HTTP cache; the .nc downloads must bypass it
+    listing_url = "https://www.ncei.noaa.gov/data/oceans/argo/gadr/data/indian/2020/"
+    nc_url = listing_url + "nodc_D1901234_001.nc"
+    urls_expire_after = processor.session.settings.urls_expire_after
+    if get_url_expiration(listing_url, urls_expire_after) == DO_NOT_CACHE:
+        print(f"   ❌ Directory listing would not be cached: {listing_url}")
+        return False
+    if get_url_expiration(nc_url, urls_expire_after) != DO_NOT_CACHE:
+        print(f"   ❌ NetCDF download would be cached: {nc_url}")
+        return False
+    print("   ✅ Listings cached, NetCDF downloads not cached")
+    
     # Test 3: Data source discovery
     print("\n3️⃣ Testing Data Source Discovery...")
     try:
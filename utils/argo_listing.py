@@ -0,0 +1,72 @@
+"""
+Argo mirror directory listings
+Shared session and streaming href scanner for the data check scripts
+"""
+
+import re
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Apache listings are regular, so hrefs are scanned straight from the bytes;
+# the lookahead skips the parent-directory link
+NC_RE = re.compile(rb'href="(?!\.\.)([^"]+\.nc)"')
+DIR_RE = re.compile(rb'href="(?!\.\.)([^"/]+)/"')
+
+# Shared session so listings reuse pooled keep-alive connections; transient
+# mirror errors are retried with backoff instead of failing the check
+SESSION = requests.Session()
+SESSION.headers.update({"Accept-Encoding": "gzip, deflate"})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+))
+
+def _scan_windows(response):
+    """Yield (buf, end) pairs over a streamed listing body. Every tag lies
+    wholly before `end` in exactly one pair, so no href is split or repeated."""
+    tail = b""
+    for chunk in response.iter_content(65536):
+        buf = tail + chunk
+        # Only scan up to the last tag start so no href is split across chunks
+        cut = max(buf.rfind(b"<"), 0)
+        yield buf, cut
+        tail = buf[cut:]
+    yield tail, len(tail)
+
+def scan_listing(url, *patterns):
+    """Stream a directory listing and collect the hrefs matching each pattern.
+    Returns (status_code, [hrefs per pattern]) without holding the full body."""
+    with SESSION.get(url, stream=True, timeout=15) as response:
+        found = [[] for _ in patterns]
+        if response.status_code != 200:
+            return response.status_code, found
+        
+        for buf, end in _scan_windows(response):
+            for pattern, hrefs in zip(patterns, found):
+                hrefs.extend(pattern.findall(buf, 0, end))
+        
+        return response.status_code, [[href.decode() for href in hrefs] for hrefs in found]
+
+def sample_listing(url, pattern, limit):
+    """Stream a listing and stop reading once more than `limit` hrefs match.
+    Returns (status_code, sample, count, complete), keeping only the first
+    `limit` names; complete is False when the rest of the listing was left
+    unread, so count is then only a lower bound."""
+    with SESSION.get(url, stream=True, timeout=15) as response:
+        if response.status_code != 200:
+            return response.status_code, [], 0, True
+        
+        sample = []
+        count = 0
+        for buf, end in _scan_windows(response):
+            for match in pattern.finditer(buf, 0, end):
+                count += 1
+                if len(sample) < limit:
+                    sample.append(match.group(1).decode())
+            if count > limit:
+                # Leaving the block closes the connection without reading the rest
+                return response.status_code, sample, count, False
+        
+        return response.status_code, sample, count, True
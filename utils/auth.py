@@ -33,6 +33,11 @@ MOCK_USERS = [
     }
 ]
 
+@st.cache_resource
+def _load_users() -> Dict[str, Dict]:
+    """Index the user table by email once per process"""
+    return {u['email']: u for u in MOCK_USERS}
+
 def check_authentication(email: str, password: str) -> bool:
     """
     Check if the provided credentials are valid
@@ -44,9 +49,9 @@ def check_authentication(email: str, password: str) -> bool:
     Returns:
         bool: True if credentials are valid, False otherwise
     """
-    user = next((u for u in MOCK_USERS if u['email'] == email and u['password'] == password), None)
+    user = _load_users().get(email)
     
-    if user:
+    if user and user['password'] == password:
         # Store user in session state
         st.session_state.authenticated = True
         st.session_state.user = {
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 import random
 import pandas as pd
+import streamlit as st
 from typing import List, Dict, Any
 from utils.database import ArgoDatabase
 
@@ -14,6 +15,7 @@ def get_database():
         _db_instance = ArgoDatabase()
     return _db_instance
 
+@st.cache_data(ttl=300, max_entries=4)
 def get_real_argo_data(limit: int = 100) -> pd.DataFrame:
     """Get real ARGO data from TiDB Cloud database"""
     try:
@@ -34,6 +36,7 @@ def get_real_argo_data(limit: int = 100) -> pd.DataFrame:
         print(f"Error getting real ARGO data: {e}")
         return pd.DataFrame()
 
+@st.cache_data(ttl=300, max_entries=1)
 def get_argo_summary_stats() -> Dict[str, Any]:
     """Get summary statistics from ARGO data in TiDB Cloud"""
     try:
@@ -89,15 +92,13 @@ def get_argo_summary_stats() -> Dict[str, Any]:
             """
             regional_df = pd.read_sql_query(regional_query, conn)
             
-            stats['regional_breakdown'] = [
-                {
-                    'region': row['region'],
-                    'count': int(row['count']),
-                    'avg_temperature': round(float(row['avg_temp']), 2) if pd.notna(row['avg_temp']) else 0,
-                    'avg_salinity': round(float(row['avg_sal']), 2) if pd.notna(row['avg_sal']) else 0
-                }
-                for _, row in regional_df.iterrows()
-            ]
+            stats['regional_breakdown'] = (
+                regional_df
+                .rename(columns={'avg_temp': 'avg_temperature', 'avg_sal': 'avg_salinity'})
+                .fillna({'avg_temperature': 0, 'avg_salinity': 0})
+                .round({'avg_temperature': 2, 'avg_salinity': 2})
+                .astype({'region': 'category', 'count': 'int64'})
+            )
             
             return stats
         
@@ -111,9 +112,12 @@ def get_argo_summary_stats() -> Dict[str, Any]:
             'avg_ph': 0,
             'earliest_date': None,
             'latest_date': None,
-            'regional_breakdown': []
+            'regional_breakdown': pd.DataFrame(
+                columns=['region', 'count', 'avg_temperature', 'avg_salinity']
+            )
         }
 
+@st.cache_data(ttl=300, max_entries=1)
 def get_mock_agrobots() -> List[Dict[str, Any]]:
     """Get mock Agro-Bot data"""
     return [
@@ -187,6 +191,7 @@ def get_mock_agrobots() -> List[Dict[str, Any]]:
         }
     ]
 
+@st.cache_data(ttl=300, max_entries=1)
 def get_mock_alerts() -> List[Dict[str, Any]]:
     """Get mock alert data"""
     return [
@@ -222,6 +227,7 @@ def get_mock_alerts() -> List[Dict[str, Any]]:
         }
     ]
 
+@st.cache_data(ttl=300, max_entries=1)
 def get_recent_data() -> List[Dict[str, Any]]:
     """Get recent time-series data for charts"""
     times = []
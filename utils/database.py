@@ -59,7 +59,16 @@ class ArgoDatabase:
             # Create TiDB connection string
             connection_string = f"mysql+pymysql://{tidb_user}:{tidb_password}@{tidb_host}:{tidb_port}/{tidb_database}?ssl_ca=&ssl_cert=&ssl_key=&ssl_verify_cert=true&ssl_verify_identity=true"
             
-            self.engine = create_engine(connection_string)
+            # Keep a small pool of warm connections so every query and health
+            # check reuses an open TLS session; recycle them before TiDB Cloud
+            # drops idle connections on its side
+            self.engine = create_engine(
+                connection_string,
+                pool_size=5,
+                max_overflow=5,
+                pool_recycle=300,
+                pool_pre_ping=True,
+            )
             self.use_tidb = True
             self.logger.info(f"Connected to TiDB Cloud: {tidb_host}:{tidb_port}/{tidb_database}")
             
@@ -268,13 +277,12 @@ class ArgoDatabase:
         """Check TiDB database health and return status"""
         try:
             with self.engine.connect() as conn:
-                # Test connection
-                conn.execute(text("SELECT 1"))
-                
-                # Count records in main tables
-                argo_count = conn.execute(text("SELECT COUNT(*) FROM argo_profiles")).scalar()
-                conditions_count = conn.execute(text("SELECT COUNT(*) FROM ocean_conditions")).scalar()
-                bots_count = conn.execute(text("SELECT COUNT(*) FROM agro_bots")).scalar()
+                # Test connection and count records in main tables in one round-trip
+                argo_count, conditions_count, bots_count = conn.execute(text("""
+                    SELECT (SELECT COUNT(*) FROM argo_profiles),
+                           (SELECT COUNT(*) FROM ocean_conditions),
+                           (SELECT COUNT(*) FROM agro_bots)
+                """)).one()
                 
                 # Check data source type
                 data_source = "Real NetCDF Data" if self.use_real_data or argo_count > 50 else "Sample Data"
@@ -20,6 +20,7 @@ import sqlite3
 from pathlib import Path
 from sqlalchemy import create_engine, text
 import requests
+import requests_cache
 from bs4 import BeautifulSoup
 import re
 
@@ -62,6 +63,18 @@ class IndianOceanArgoProcessor:
         self.db_path = db_path
         self.logger = self._setup_logging()
         
+        # Reuse connections to the mirrors across listing and download requests.
+        # Directory listings are cached on disk for an hour (revalidated with
+        # ETag/Last-Modified after that); the .nc downloads are never cached.
+        # The pattern is anchored to the URL's end: a '*.nc' glob would also
+        # match the www.ncei.noaa.gov host and skip caching its listings.
+        self.session = requests_cache.CachedSession(
+            cache_name='.argo_http_cache',
+            backend='sqlite',
+            expire_after=3600,
+            urls_expire_after={re.compile(r'\.nc$'): requests_cache.DO_NOT_CACHE},
+        )
+        
         # Create download directory
         os.makedirs(self.config.download_folder, exist_ok=True)
     
@@ -77,120 +90,125 @@ class IndianOceanArgoProcessor:
         )
         return logging.getLogger(__name__)
     
+    def _list_hrefs(self, url: str) -> List[str]:
+        """Return the hrefs in a directory listing. Repeat requests are served
+        or revalidated by the session's HTTP cache."""
+        response = self.session.get(url, timeout=30)
+        response.raise_for_status()
+        
+        soup = BeautifulSoup(response.content, 'html.parser', from_encoding='utf-8')
+        return [link['href'] for link in soup.find_all('a', href=True)]
+    
     def discover_netcdf_files(self, base_url: str, max_files: int = 50) -> List[str]:
         """
         Discover NetCDF files from year-based directory structure.
         Handles both flat year directories and monthly subdirectories.
+        Year directories are listed concurrently and collected in year order.
         """
         netcdf_files = []
         
         try:
-            for year in range(self.config.start_year, self.config.end_year + 1):
-                if len(netcdf_files) >= max_files:
-                    break
-                    
-                year_url = urljoin(base_url, f"{year}/")
-                self.logger.info(f"Discovering files in {year_url}")
-                
-                try:
-                    # Get directory listing
-                    response = requests.get(year_url, timeout=30)
-                    response.raise_for_status()
-                    
-                    # Parse HTML directory listing
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    links = soup.find_all('a', href=True)
-                    
-                    # Look for direct NetCDF files and monthly directories
-                    year_files = []
-                    monthly_dirs = []
-                    
-                    for link in links:
-                        href = link.get('href', '')
-                        if not href or href.startswith('..'):
-                            continue
-                            
-                        if href.endswith('.nc'):
-                            # Direct NetCDF file
-                            file_url = urljoin(year_url, href)
-                            year_files.append(file_url)
-                        elif href.endswith('/') and re.match(r'^(0[1-9]|1[0-2])/$', href):
-                            # Monthly directory (01/, 02/, ..., 12/)
-                            monthly_dirs.append(href.rstrip('/'))
-                    
-                    # If we found direct NetCDF files, use them
-                    if year_files:
-                        # Limit files per year
-                        if len(year_files) > self.config.max_files_per_year:
-                            year_files = year_files[:self.config.max_files_per_year]
-                        netcdf_files.extend(year_files)
-                        self.logger.info(f"Found {len(year_files)} NetCDF files for year {year}")
-                    
-                    # If we found monthly directories, explore them
-                    elif monthly_dirs:
-                        self.logger.info(f"Found {len(monthly_dirs)} monthly directories for year {year}")
-                        monthly_files = []
-                        
-                        # Filter to only process configured months
-                        target_months = []
-                        for month_num in range(self.config.start_month, self.config.end_month + 1):
-                            month_str = f"{month_num:02d}"
-                            if month_str in monthly_dirs:
-                                target_months.append(month_str)
-                        
-                        self.logger.info(f"Processing {len(target_months)} target months: {target_months}")
-                        
-                        for month in target_months:
-                            month_url = urljoin(year_url, f"{month}/")
-                            try:
-                                month_response = requests.get(month_url, timeout=30)
-                                month_response.raise_for_status()
-                                
-                                month_soup = BeautifulSoup(month_response.content, 'html.parser')
-                                month_links = month_soup.find_all('a', href=True)
-                                
-                                month_file_count = 0
-                                for month_link in month_links:
-                                    month_href = month_link.get('href', '')
-                                    if month_href and month_href.endswith('.nc') and not month_href.startswith('..'):
-                                        if month_file_count >= self.config.max_files_per_year:
-                                            break
-                                        file_url = urljoin(month_url, month_href)
-                                        monthly_files.append(file_url)
-                                        month_file_count += 1
-                                
-                                self.logger.info(f"Found {month_file_count} files in {year}/{month} (limited to {self.config.max_files_per_year})")
-                                
-                            except Exception as e:
-                                self.logger.warning(f"Error accessing monthly directory {month_url}: {e}")
-                                continue
-                        
-                        # Limit total monthly files per year
-                        if len(monthly_files) > self.config.max_files_per_year:
-                            monthly_files = monthly_files[:self.config.max_files_per_year]
-                        
-                        netcdf_files.extend(monthly_files)
-                        self.logger.info(f"Total files collected for year {year}: {len(monthly_files)}")
-                    
-                    else:
-                        self.logger.info(f"No NetCDF files found for year {year}")
-                    
-                except Exception as e:
-                    self.logger.warning(f"Could not access {year_url}: {e}")
-                    continue
+            years = range(self.config.start_year, self.config.end_year + 1)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                for year_files in executor.map(lambda year: self._discover_year(base_url, year), years):
+                    netcdf_files.extend(year_files)
         
         except Exception as e:
             self.logger.error(f"Error discovering files from {base_url}: {e}")
         
         return netcdf_files[:max_files]
     
+    def _discover_year(self, base_url: str, year: int) -> List[str]:
+        """List one year directory, descending into its monthly directories if needed"""
+        year_url = urljoin(base_url, f"{year}/")
+        self.logger.info(f"Discovering files in {year_url}")
+        
+        try:
+            # Get directory listing
+            hrefs = self._list_hrefs(year_url)
+            
+            # Look for direct NetCDF files and monthly directories
+            year_files = []
+            monthly_dirs = []
+            
+            for href in hrefs:
+                if not href or href.startswith('..'):
+                    continue
+                    
+                if href.endswith('.nc'):
+                    # Direct NetCDF file
+                    file_url = urljoin(year_url, href)
+                    year_files.append(file_url)
+                elif href.endswith('/') and re.match(r'^(0[1-9]|1[0-2])/$', href):
+                    # Monthly directory (01/, 02/, ..., 12/)
+                    monthly_dirs.append(href.rstrip('/'))
+            
+            # If we found direct NetCDF files, use them
+            if year_files:
+                # Limit files per year
+                if len(year_files) > self.config.max_files_per_year:
+                    year_files = year_files[:self.config.max_files_per_year]
+                self.logger.info(f"Found {len(year_files)} NetCDF files for year {year}")
+                return year_files
+            
+            # If we found monthly directories, explore them
+            elif monthly_dirs:
+                self.logger.info(f"Found {len(monthly_dirs)} monthly directories for year {year}")
+                
+                # Filter to only process configured months
+                target_months = []
+                for month_num in range(self.config.start_month, self.config.end_month + 1):
+                    month_str = f"{month_num:02d}"
+                    if month_str in monthly_dirs:
+                        target_months.append(month_str)
+                
+                self.logger.info(f"Processing {len(target_months)} target months: {target_months}")
+                
+                monthly_files = []
+                with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+                    for month_files in executor.map(lambda month: self._discover_month(year_url, year, month), target_months):
+                        monthly_files.extend(month_files)
+                
+                # Limit total monthly files per year
+                if len(monthly_files) > self.config.max_files_per_year:
+                    monthly_files = monthly_files[:self.config.max_files_per_year]
+                
+                self.logger.info(f"Total files collected for year {year}: {len(monthly_files)}")
+                return monthly_files
+            
+            else:
+                self.logger.info(f"No NetCDF files found for year {year}")
+            
+        except Exception as e:
+            self.logger.warning(f"Could not access {year_url}: {e}")
+        
+        return []
+    
+    def _discover_month(self, year_url: str, year: int, month: str) -> List[str]:
+        """List the NetCDF files in one monthly directory"""
+        month_url = urljoin(year_url, f"{month}/")
+        month_files = []
+        try:
+            for month_href in self._list_hrefs(month_url):
+                if month_href and month_href.endswith('.nc') and not month_href.startswith('..'):
+                    if len(month_files) >= self.config.max_files_per_year:
+                        break
+                    month_files.append(urljoin(month_url, month_href))
+            
+            self.logger.info(f"Found {len(month_files)} files in {year}/{month} (limited to {self.config.max_files_per_year})")
+            
+        except Exception as e:
+            self.logger.warning(f"Error accessing monthly directory {month_url}: {e}")
+        
+        return month_files
+    
     def download_file_http(self, file_url: str, dest_path: str) -> bool:
         """Download a single NetCDF file via HTTP"""
         try:
             self.logger.info(f"Downloading {os.path.basename(file_url)}...")
             
             # Use requests with timeout and retries
-            response = requests.get(file_url, timeout=120, stream=True)
+            response = self.session.get(file_url, timeout=120, stream=True)
             response.raise_for_status()
             
             with open(dest_path, 'wb') as f: